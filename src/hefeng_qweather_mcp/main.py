@@ -4,27 +4,74 @@ Version: 0.3.3
 License: MIT
 """
 
+import asyncio
+import atexit
+import csv
+import diskcache  # type: ignore[import-untyped]
 import httpx
 from mcp.server.fastmcp import FastMCP
 from dotenv import load_dotenv
+import functools
 import logging
+import logging.handlers
 import os
+import queue
+import random
+import re
+import threading
 import time
-from datetime import datetime, timedelta, timezone
-import jwt
-from typing import Optional, Dict, Any
+from datetime import date as date_type, datetime, timedelta, timezone
+import orjson
+from types import MappingProxyType
+from typing import (
+    Optional,
+    Dict,
+    Any,
+    Awaitable,
+    Callable,
+    List,
+    Mapping,
+    Tuple,
+    TypeVar,
+)
 import typer
 
-# 配置日志
-logging.basicConfig(
-    level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    将日志记录原样放入队列的 QueueHandler
+
+    默认的 prepare() 会在调用线程上格式化消息；记录只在进程内传递，
+    无需提前格式化，留给后台线程的处理器统一完成
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+# 配置日志：日志记录经队列交给后台线程，由其完成消息格式化并写入 stderr，
+# 避免在事件循环上执行格式化和同步 I/O；根 logger 已配置处理器时（如嵌入其他程序）保持不变
+_LOG_QUEUE: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+_log_stream_handler = logging.StreamHandler()
+_log_stream_handler.setFormatter(
+    logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
 )
+_LOG_LISTENER = logging.handlers.QueueListener(_LOG_QUEUE, _log_stream_handler)
+_root_logger = logging.getLogger()
+if not _root_logger.handlers:
+    _root_logger.addHandler(_DeferredQueueHandler(_LOG_QUEUE))
+    _root_logger.setLevel(logging.INFO)
+    _LOG_LISTENER.start()
+    atexit.register(_LOG_LISTENER.stop)  # 退出前写出队列中剩余的日志
 logger = logging.getLogger("hefeng_qweather_mcp")
 
 # 加载环境变量
-# 尝试从多个位置加载 .env 文件以提高鲁棒性
-load_dotenv()  # 默认：当前工作目录
-load_dotenv(os.path.join(os.path.dirname(__file__), "..", "..", ".env"))  # 项目根目录
+# 尝试从多个位置加载 .env 文件以提高鲁棒性；生产环境可设置 HEFENG_SKIP_DOTENV=1 跳过
+PROJECT_ROOT_ENV = os.path.join(os.path.dirname(__file__), "..", "..", ".env")
+if os.environ.get("HEFENG_SKIP_DOTENV") != "1":
+    load_dotenv()  # 默认：当前工作目录
+    if os.path.exists(PROJECT_ROOT_ENV):
+        load_dotenv(PROJECT_ROOT_ENV, override=False)  # 项目根目录
 
 # 初始化MCP服务
 mcp = FastMCP("hefeng_qweather_mcp")
@@ -34,12 +81,70 @@ app = typer.Typer()
 # API配置常量
 DEFAULT_FORECAST_DAYS = 3  # 默认天气预报天数
 DEFAULT_SOLAR_HOURS = 24  # 默认太阳辐射预报小时数
+HISTORY_MAX_CONCURRENCY = 8  # 历史数据按日期并发请求的最大并发数
+BATCH_MAX_CONCURRENCY = 16  # 批量查询时的最大并发请求数
+GEO_DISK_CACHE_TTL = 30 * 86400  # 城市位置查询结果在持久化缓存中的有效期（30天）
+CST = timezone(timedelta(hours=8))  # 北京时间
 
-# POI类型常量 - 基于和风天气官方API文档
-POI_TYPES = {
+# POI类型常量 - 基于和风天气官方API文档（只读）
+POI_TYPES = MappingProxyType({
     "scenic": "景点",
     "TSTA": "潮汐站点"
-}
+})
+
+# 参数取值范围
+_VALID_FORECAST_DAYS = frozenset({"3d", "7d", "10d", "15d", "30d"})
+_VALID_INDEX_DAYS = frozenset({"1d", "3d"})
+_VALID_HOURS = frozenset({"24h", "72h", "168h"})
+_VALID_GRID_DAYS = frozenset({"3d", "7d"})
+_VALID_GRID_HOURS = frozenset({"24h", "72h"})
+_VALID_AIR_DAYS = frozenset({"3d", "7d", "15d"})
+_VALID_CITY_TYPES = frozenset({"cn", "world", "overseas"})
+_VALID_UNITS = frozenset({"m", "i"})
+
+# 环境变量中转义的换行符（字面量 \r\n 或 \n），用于还原单行配置的 PEM 私钥
+_ESCAPED_NEWLINE_RE = re.compile(r"\\(?:r\\)?n")
+
+# 最多两位小数的经度或纬度
+_COORD_RE = re.compile(r"-?\d+(?:\.\d{1,2})?")
+
+# API接口路径（相对于 https://{api_host}）
+_PATH_LOOKUP = "/geo/v2/city/lookup"
+_PATH_TOP_CITIES = "/geo/v2/city/top"
+_PATH_POI_LOOKUP = "/geo/v2/poi/lookup"
+_PATH_POI_RANGE = "/geo/v2/poi/range"
+_PATH_WEATHER = "/v7/weather"
+_PATH_WEATHER_NOW = "/v7/weather/now"
+_PATH_WARNING = "/v7/warning/now"
+_PATH_INDICES = "/v7/indices"
+_PATH_MINUTELY = "/v7/minutely/5m"
+_PATH_ASTRO_MOON = "/v7/astronomy/moon"
+_PATH_ASTRO_SUN = "/v7/astronomy/sun"
+_PATH_GRID = "/v7/grid-weather"
+_PATH_GRID_NOW = "/v7/grid-weather/now"
+_PATH_AIR = "/airquality/v1/current"
+_PATH_AIR_HOURLY = "/airquality/v1/hourly"
+_PATH_AIR_DAILY = "/airquality/v1/daily"
+_PATH_AIR_STATION = "/airquality/v1/station"
+_PATH_AIR_HIST = "/v7/historical/air"
+_PATH_WEATHER_HIST = "/v7/historical/weather"
+
+# 按预报天数/小时数预先拼好的接口路径，请求时直接查表
+_WEATHER_DAYS_PATHS = MappingProxyType(
+    {days: f"{_PATH_WEATHER}/{days}" for days in _VALID_FORECAST_DAYS}
+)
+_WEATHER_HOURS_PATHS = MappingProxyType(
+    {hours: f"{_PATH_WEATHER}/{hours}" for hours in _VALID_HOURS}
+)
+_INDICES_DAYS_PATHS = MappingProxyType(
+    {days: f"{_PATH_INDICES}/{days}" for days in _VALID_INDEX_DAYS}
+)
+_GRID_DAILY_PATHS = MappingProxyType(
+    {days: f"{_PATH_GRID}/{days}" for days in _VALID_GRID_DAYS}
+)
+_GRID_HOURLY_PATHS = MappingProxyType(
+    {hours: f"{_PATH_GRID}/{hours}" for hours in _VALID_GRID_HOURS}
+)
 
 # 从环境变量获取API配置
 api_host = os.environ.get("HEFENG_API_HOST")
@@ -48,6 +153,25 @@ project_id = os.environ.get("HEFENG_PROJECT_ID")
 key_id = os.environ.get("HEFENG_KEY_ID")
 private_key_path = os.environ.get("HEFENG_PRIVATE_KEY_PATH")
 private_key_str = os.environ.get("HEFENG_PRIVATE_KEY")
+# 持久化缓存目录（用于缓存不会变化的历史数据和城市位置查询结果）
+cache_dir = os.environ.get("HEFENG_CACHE_DIR") or os.path.join(
+    os.path.expanduser("~"), ".cache", "hefeng_qweather_mcp"
+)
+# 城市位置查询结果的缓存有效期（秒），默认24小时，设为0可关闭缓存
+DEFAULT_GEO_CACHE_TTL = 86400.0
+try:
+    geo_cache_ttl = float(
+        os.environ.get("HEFENG_GEO_CACHE_TTL", str(DEFAULT_GEO_CACHE_TTL))
+    )
+except ValueError:
+    logger.warning(
+        "HEFENG_GEO_CACHE_TTL 取值无效: %s，使用默认值 %.0f 秒",
+        os.environ.get("HEFENG_GEO_CACHE_TTL"),
+        DEFAULT_GEO_CACHE_TTL,
+    )
+    geo_cache_ttl = DEFAULT_GEO_CACHE_TTL
+# 预置城市位置的 CSV 文件（表头 city,id,lat,lon），命中的城市无需请求 GeoAPI
+city_csv_path = os.environ.get("HEFENG_CITY_CSV")
 
 # 验证必需的环境变量
 if not api_host:
@@ -56,10 +180,12 @@ if not api_host:
 # 优先使用API KEY认证，如果不可用则使用JWT认证
 if api_key:
     # 使用API KEY认证（推荐）
-    auth_header = {"X-QW-Api-Key": api_key, "Content-Type": "application/json"}
+    auth_header: Mapping[str, str] = MappingProxyType(
+        {"X-QW-Api-Key": api_key, "Content-Type": "application/json"}
+    )
     logger.info("使用API KEY认证模式")
-    logger.info(f"API主机: {api_host}")
-    logger.info(f"API KEY: {api_key[:10]}...")
+    logger.info("API主机: %s", api_host)
+    logger.info("API KEY: %s...", api_key[:10])
 else:
     # 使用JWT认证（备用方案）
     JWT_EXPIRY_SECONDS = 900  # JWT令牌过期时间（15分钟）
@@ -70,7 +196,38 @@ else:
             "必须设置 HEFENG_API_KEY，或者设置完整的JWT认证配置（HEFENG_PROJECT_ID, HEFENG_KEY_ID, HEFENG_PRIVATE_KEY_PATH/HEFENG_PRIVATE_KEY）"
         )
 
-    # 读取私钥
+    logger.info("使用JWT认证模式")
+    logger.info("API主机: %s", api_host)
+    logger.info("项目ID: %s", project_id)
+    logger.info("密钥ID: %s", key_id)
+
+
+# JWT令牌缓存："token" -> (令牌, 过期时间戳)
+JWT_REFRESH_MARGIN_SECONDS = 60  # 距离过期不足该秒数时提前刷新令牌
+_JWT_CACHE: Dict[str, Tuple[str, float]] = {}
+_JWT_LOCK = threading.Lock()
+_SIGNING_KEY: Any = None  # 首次签发JWT时加载的私钥
+
+
+def _load_signing_key() -> Any:
+    """
+    读取并解析JWT签名私钥，仅在首次签发令牌时执行一次
+
+    导入模块时不读取私钥文件，避免拖慢 stdio 模式的冷启动。
+    私钥只解析一次，避免每次签发JWT都重新解析PEM；
+    解析失败时退回原始字节，由 PyJWT 自行处理。
+
+    Raises:
+        FileNotFoundError: 私钥文件不存在时抛出
+        Exception: 读取私钥文件失败时抛出
+    """
+    global _SIGNING_KEY
+    if _SIGNING_KEY is not None:
+        return _SIGNING_KEY
+
+    # 仅 JWT 模式需要 cryptography，延迟导入以缩短 API KEY 模式的启动时间
+    from cryptography.hazmat.primitives.serialization import load_pem_private_key
+
     private_key: bytes
     if private_key_path:
         try:
@@ -82,39 +239,472 @@ else:
             raise Exception(f"读取私钥文件失败: {e}")
     else:
         assert private_key_str is not None
-        private_key = (
-            private_key_str.replace("\\r\\n", "\n").replace("\\n", "\n").encode()
-        )
+        private_key = _ESCAPED_NEWLINE_RE.sub("\n", private_key_str).encode()
 
-    # 生成JWT令牌
-    payload = {
-        "iat": int(time.time()),
-        "exp": int(time.time()) + JWT_EXPIRY_SECONDS,
-        "sub": project_id,
-    }
+    signing_key: Any = private_key
+    try:
+        signing_key = load_pem_private_key(private_key, password=None)
+    except Exception as e:
+        logger.warning("预解析私钥失败，将使用原始PEM数据签名: %s", e)
+
+    _SIGNING_KEY = signing_key
+    return signing_key
+
+
+# 当前认证头：只读映射，JWT 刷新时整体替换（单次赋值，读取方无需加锁）
+_AUTH: Mapping[str, str] = auth_header if api_key else MappingProxyType({})
+
+
+def _mint_jwt() -> Tuple[str, float]:
+    """
+    生成新的JWT令牌
+
+    Returns:
+        (令牌字符串, 过期时间戳)
+
+    Raises:
+        Exception: 令牌签名失败时抛出
+    """
+    import jwt  # 仅 JWT 模式需要，延迟导入
+
+    signing_key = _load_signing_key()
+    now = int(time.time())
+    exp = now + JWT_EXPIRY_SECONDS
+    payload = {"iat": now, "exp": exp, "sub": project_id}
     headers = {"kid": key_id}
 
     try:
         encoded_jwt = jwt.encode(
-            payload, private_key, algorithm="EdDSA", headers=headers
+            payload, signing_key, algorithm="EdDSA", headers=headers
         )
     except Exception as e:
         raise Exception(f"JWT令牌生成失败: {e}")
 
-    # 认证头
-    auth_header = {
-        "Authorization": f"Bearer {encoded_jwt}",
-    }
-    logger.info("使用JWT认证模式")
-    logger.info(f"API主机: {api_host}")
-    logger.info(f"项目ID: {project_id}")
-    logger.info(f"密钥ID: {key_id}")
+    return encoded_jwt, float(exp)
+
+
+def _current_auth_header() -> Mapping[str, str]:
+    """
+    获取当前有效的认证头
+
+    API KEY 模式直接返回固定认证头；JWT 模式复用缓存的令牌，
+    在令牌即将过期时重新签发并替换 _AUTH。
+    """
+    global _AUTH
+    if api_key:
+        return _AUTH
+
+    with _JWT_LOCK:
+        cached = _JWT_CACHE.get("token")
+        if cached is None or time.time() > cached[1] - JWT_REFRESH_MARGIN_SECONDS:
+            cached = _mint_jwt()
+            _JWT_CACHE["token"] = cached
+            _AUTH = MappingProxyType({"Authorization": f"Bearer {cached[0]}"})
+
+    return _AUTH
+
+
+# 共享的HTTP客户端：复用连接池并启用HTTP/2，避免每次请求都重新建立TCP+TLS连接；
+# JSON 响应压缩率很高，显式声明支持 brotli/zstd/gzip 压缩
+# 认证头作为客户端默认请求头，单次请求无需再传 headers；
+# JWT 模式下令牌在首次请求时才签发，由 _sync_client_auth 写入默认请求头；
+# 传输层对建立连接失败（ConnectError/ConnectTimeout）自动重试，
+# _get_with_retry 不再重复重试这两类错误，只重试其他传输错误和可重试的状态码
+CONNECT_RETRIES = 3
+_ACLIENT = httpx.AsyncClient(
+    base_url=f"https://{api_host}",
+    headers={"Accept-Encoding": "br, zstd, gzip", **_AUTH},
+    timeout=httpx.Timeout(5.0, connect=2.0),
+    transport=httpx.AsyncHTTPTransport(
+        http2=True,
+        retries=CONNECT_RETRIES,
+        limits=httpx.Limits(
+            max_keepalive_connections=32, max_connections=64, keepalive_expiry=60.0
+        ),
+    ),
+)
+
+
+_CLIENT_AUTH = _AUTH  # 已同步到 _ACLIENT 默认请求头的认证头
+
+
+def _sync_client_auth() -> None:
+    """JWT 令牌刷新后，将新的认证头同步到共享客户端的默认请求头"""
+    global _CLIENT_AUTH
+    auth = _current_auth_header()
+    if auth is not _CLIENT_AUTH:
+        _ACLIENT.headers.update(auth)
+        _CLIENT_AUTH = auth
+
+
+def _decode(response: httpx.Response) -> Any:
+    """使用 orjson 解析响应体，比 response.json() 使用的标准库 json 更快"""
+    return orjson.loads(response.content)
+
+
+ERROR_BODY_MAX_BYTES = 512  # 错误日志中响应体的最大字节数
+
+
+def _error_body(response: httpx.Response) -> str:
+    """截取错误响应体的开头部分，避免网关返回的大段 HTML 错误页被整体解码"""
+    return response.content[:ERROR_BODY_MAX_BYTES].decode("utf-8", errors="replace")
+
+
+# 重试策略：仅对限流(429)、网关类错误(502/503/504)及传输层异常重试
+RETRY_MAX_ATTEMPTS = 4
+# 单次调用（含全部重试和退避）的总时限（秒），避免上游卡顿时工具调用超过 MCP 客户端的等待时间
+REQUEST_DEADLINE_SECONDS = 15.0
+RETRY_BACKOFF_INITIAL = 0.2  # 首次退避上限（秒）
+RETRY_BACKOFF_MAX = 2.0  # 单次退避上限（秒）
+RETRY_AFTER_MAX = 10.0  # 服务端 Retry-After 的最长等待（秒）
+_RETRY_STATUS = frozenset({429, 502, 503, 504})
+
+# 熔断：同一接口重试后仍连续失败达到阈值时，在一段时间内直接拒绝请求，
+# 避免上游故障时每次调用都耗尽重试和超时；熔断期过后放行请求试探接口是否恢复
+CIRCUIT_FAIL_MAX = 10  # 触发熔断的连续失败次数
+CIRCUIT_RESET_SECONDS = 30.0  # 熔断持续时间（秒）
+# 接口熔断状态：接口路径 -> (连续失败次数, 熔断截止时间)
+_CIRCUIT: Dict[str, Tuple[int, float]] = {}
+# 路径末尾带经纬度或站点ID的接口，按这些前缀归为同一熔断分组
+_CIRCUIT_PREFIXES: Tuple[str, ...] = (
+    _PATH_AIR,
+    _PATH_AIR_HOURLY,
+    _PATH_AIR_DAILY,
+    _PATH_AIR_STATION,
+)
+
+
+def _retry_delay(attempt: int, response: Optional[httpx.Response] = None) -> float:
+    """
+    计算第 attempt 次（从 0 开始）重试前的等待时间
+
+    优先遵循响应中的 Retry-After 头（秒数形式），否则使用带抖动的指数退避。
+    """
+    if response is not None:
+        retry_after = response.headers.get("Retry-After")
+        if retry_after is not None:
+            try:
+                return min(max(float(retry_after), 0.0), RETRY_AFTER_MAX)
+            except ValueError:
+                pass
+    backoff = min(RETRY_BACKOFF_INITIAL * (2**attempt), RETRY_BACKOFF_MAX)
+    return random.uniform(0, backoff)
+
+
+def _circuit_key(path: str) -> str:
+    """返回接口路径的熔断分组：去掉末尾的经纬度或站点ID，其余接口按完整路径区分"""
+    for prefix in _CIRCUIT_PREFIXES:
+        if path.startswith(prefix + "/"):
+            return prefix
+    return path
+
+
+def _circuit_failure(endpoint: str) -> None:
+    """记录接口的一次失败，连续失败达到阈值时开启熔断"""
+    failures = _CIRCUIT.get(endpoint, (0, 0.0))[0] + 1
+    _CIRCUIT[endpoint] = (failures, time.monotonic() + CIRCUIT_RESET_SECONDS)
+    if failures >= CIRCUIT_FAIL_MAX:
+        logger.warning(
+            "接口 %s 连续失败 %s 次，%.0f 秒内暂停请求",
+            endpoint,
+            failures,
+            CIRCUIT_RESET_SECONDS,
+        )
+
+
+async def _get_with_retry(
+    path: str,
+    params: Optional[Dict[str, str]] = None,
+    headers: Optional[Dict[str, str]] = None,
+) -> httpx.Response:
+    """
+    发送 GET 请求，遇到瞬时错误时按退避策略重试
+
+    Args:
+        path: 接口路径
+        params: 查询参数
+        headers: 额外的请求头（如条件请求的 If-None-Match）
+
+    Returns:
+        最后一次请求的响应（可能仍是非 200 状态码）
+
+    Raises:
+        httpx.TransportError: 重试次数用尽后仍发生传输层错误；
+            建立连接失败已由传输层重试过，直接抛出
+        httpx.TimeoutException: 超过 REQUEST_DEADLINE_SECONDS 仍未完成
+        httpx.RequestError: 接口处于熔断状态，请求未发出
+    """
+    endpoint = _circuit_key(path)
+    failures, open_until = _CIRCUIT.get(endpoint, (0, 0.0))
+    if failures >= CIRCUIT_FAIL_MAX:
+        now = time.monotonic()
+        if now < open_until:
+            raise httpx.RequestError(
+                f"接口 {endpoint} 连续失败 {failures} 次，已暂停请求"
+            )
+        # 熔断期已过：仅放行本次请求试探接口，试探结束前其余请求继续被拒绝
+        _CIRCUIT[endpoint] = (failures, now + CIRCUIT_RESET_SECONDS)
+
+    try:
+        async with asyncio.timeout(REQUEST_DEADLINE_SECONDS):
+            return await _retry_loop(path, params, headers, endpoint)
+    except TimeoutError:
+        _circuit_failure(endpoint)
+        raise httpx.TimeoutException(
+            f"请求 {path} 超过 {REQUEST_DEADLINE_SECONDS:g} 秒仍未完成"
+        )
+
+
+async def _retry_loop(
+    path: str,
+    params: Optional[Dict[str, str]],
+    headers: Optional[Dict[str, str]],
+    endpoint: str,
+) -> httpx.Response:
+    """_get_with_retry 的重试循环，endpoint 为熔断分组，其余参数同 _get_with_retry"""
+    attempt = 0
+    while True:
+        last = attempt >= RETRY_MAX_ATTEMPTS - 1
+        try:
+            if not api_key:
+                _sync_client_auth()
+            response = await _ACLIENT.get(path, params=params, headers=headers)
+        except httpx.TransportError as e:
+            if last or isinstance(e, (httpx.ConnectError, httpx.ConnectTimeout)):
+                _circuit_failure(endpoint)
+                raise
+            delay = _retry_delay(attempt)
+            logger.warning("请求 %s 发生传输错误，%.2f 秒后重试: %s", path, delay, e)
+        else:
+            if last or response.status_code not in _RETRY_STATUS:
+                if response.status_code >= 500 or response.status_code == 429:
+                    _circuit_failure(endpoint)
+                elif endpoint in _CIRCUIT:
+                    del _CIRCUIT[endpoint]
+                return response
+            delay = _retry_delay(attempt, response)
+            logger.warning(
+                "请求 %s 返回状态码 %s，%.2f 秒后重试", path, response.status_code, delay
+            )
+        await asyncio.sleep(delay)
+        attempt += 1
+
+
+# 接口响应缓存有效期（秒），按路径前缀匹配，先匹配者优先；None 表示不缓存。
+# 预报、空气质量、热门城市、POI 等数据分钟到小时级才变化，短期内重复查询直接复用；
+# 0 表示每次都请求服务端，但携带上次响应的 ETag，未修改时只返回 304 而无需重新下载响应体
+_RESPONSE_TTL: Tuple[Tuple[str, Optional[float]], ...] = (
+    (_PATH_GRID_NOW, None),
+    (_PATH_GRID, 1800),
+    (_PATH_AIR_HOURLY, 600),
+    (_PATH_AIR_DAILY, 600),
+    (_PATH_AIR_STATION, 600),
+    (_PATH_TOP_CITIES, 86400),
+    (_PATH_POI_LOOKUP, 3600),
+    (_PATH_POI_RANGE, 3600),
+    (_PATH_WEATHER, 0),
+    (_PATH_WARNING, 0),
+)
+RESPONSE_CACHE_MAXSIZE = 1024  # 响应缓存最大条目数，超出时淘汰最早写入的条目
+
+# 接口响应缓存：(路径, 排序后的参数) -> (过期时间, 响应数据, ETag)
+# 过期条目保留到被淘汰为止，以便携带 ETag 发起条件请求，未修改时服务端只返回 304
+_RESPONSE_CACHE: Dict[
+    Tuple[str, Tuple[Tuple[str, str], ...]], Tuple[float, Any, Optional[str]]
+] = {}
+_RESPONSE_CACHE_LOCK = threading.Lock()
+# 进行中的请求：(路径, 排序后的参数) -> 请求任务，参数相同的并发请求共享同一任务
+_REQUEST_INFLIGHT: Dict[
+    Tuple[str, Tuple[Tuple[str, str], ...]], "asyncio.Future[Optional[Dict[str, Any]]]"
+] = {}
+
+
+def _response_ttl(path: str) -> Optional[float]:
+    """返回接口路径对应的响应缓存有效期（秒），不缓存时返回None"""
+    for prefix, ttl in _RESPONSE_TTL:
+        if path.startswith(prefix):
+            return ttl
+    return None
+
+
+_K = TypeVar("_K")
+_T = TypeVar("_T")
+
+
+async def _single_flight(
+    inflight: Dict[_K, "asyncio.Future[_T]"],
+    key: _K,
+    start: Callable[[], Awaitable[_T]],
+) -> _T:
+    """
+    同一键的并发调用共享同一任务：首个调用方通过 start 创建任务并登记到 inflight，
+    其余调用方等待同一任务的结果，任务完成后从 inflight 中移除
+    """
+    task = inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(start())
+        inflight[key] = task
+        task.add_done_callback(lambda _: inflight.pop(key, None))
+    # shield：某个调用方被取消时，不影响其他等待同一任务的调用方
+    return await asyncio.shield(task)
+
+
+async def _request_json(
+    path: str, params: Optional[Dict[str, str]] = None, what: str = "数据"
+) -> Optional[Dict[str, Any]]:
+    """
+    发送 GET 请求并解析 JSON 响应
 
+    _RESPONSE_TTL 中配置的接口会在进程内缓存 HTTP 200 的成功响应
+    （/airquality/v1 等接口的响应没有 code 字段，有 code 字段时须为 "200"），
+    缓存过期后携带 ETag 发起条件请求；
+    参数完全相同的并发请求共享同一次网络请求。两种情况下调用方拿到的是
+    同一个字典对象，不应修改返回值。
 
-def _get_city_location(city: str, location: bool = False) -> Optional[str]:
+    Args:
+        path: 接口路径，如 "/v7/weather/now"
+        params: 查询参数
+        what: 数据名称，用于日志
+
+    Returns:
+        接口返回的 JSON 数据，如果请求失败则返回None
+    """
+    ttl = _response_ttl(path)
+    key = (path, tuple(sorted(params.items())) if params else ())
+    if ttl:
+        cached = _RESPONSE_CACHE.get(key)
+        if cached is not None and time.monotonic() < cached[0]:
+            return cached[1]
+
+    return await _single_flight(
+        _REQUEST_INFLIGHT, key, lambda: _load_json(path, params, what, key, ttl)
+    )
+
+
+async def _load_json(
+    path: str,
+    params: Optional[Dict[str, str]],
+    what: str,
+    key: Tuple[str, Tuple[Tuple[str, str], ...]],
+    ttl: Optional[float],
+) -> Optional[Dict[str, Any]]:
+    """
+    发送请求并按需写入响应缓存，参数同 _request_json，key 为缓存键，
+    ttl 为缓存有效期，None 表示不缓存
+    """
+    if ttl is None:
+        return (await _fetch_json(path, params, what))[0]
+
+    cached = _RESPONSE_CACHE.get(key)
+    etag = cached[2] if cached is not None else None
+    data, new_etag = await _fetch_json(path, params, what, etag)
+    if data is _NOT_MODIFIED:
+        assert cached is not None
+        data = cached[1]
+        new_etag = new_etag or etag
+    elif data is None or data.get("code", "200") != "200":
+        return data
+
+    with _RESPONSE_CACHE_LOCK:
+        _RESPONSE_CACHE.pop(key, None)
+        # ttl 为 0 的条目只用于条件请求，响应没有 ETag 时保存也无法复用
+        if not ttl and not new_etag:
+            return data
+        if len(_RESPONSE_CACHE) >= RESPONSE_CACHE_MAXSIZE:
+            del _RESPONSE_CACHE[next(iter(_RESPONSE_CACHE))]
+        _RESPONSE_CACHE[key] = (time.monotonic() + ttl, data, new_etag)
+    return data
+
+
+# _fetch_json 在服务端返回 304 Not Modified 时使用的标记
+_NOT_MODIFIED: Dict[str, Any] = {}
+
+
+async def _fetch_json(
+    path: str,
+    params: Optional[Dict[str, str]] = None,
+    what: str = "数据",
+    etag: Optional[str] = None,
+) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """
+    发送 GET 请求并解析 JSON 响应（不经过缓存）
+
+    Args:
+        path: 接口路径
+        params: 查询参数
+        what: 数据名称，用于日志
+        etag: 上次响应的 ETag，提供时发送 If-None-Match 进行条件请求
+
+    Returns:
+        (JSON 数据, 响应的 ETag)；304 时数据为 _NOT_MODIFIED，请求失败时数据为None
+    """
+    try:
+        headers = {"If-None-Match": etag} if etag else None
+        response = await _get_with_retry(path, params, headers)
+
+        if response.status_code == 304 and etag:
+            return _NOT_MODIFIED, response.headers.get("ETag")
+
+        if response.status_code != 200:
+            # 仅在错误日志启用时才解码响应体
+            if logger.isEnabledFor(logging.ERROR):
+                logger.error(
+                    "获取%s失败 - 状态码: %s, 响应: %s",
+                    what,
+                    response.status_code,
+                    _error_body(response),
+                )
+            return None, None
+
+        data = _decode(response)
+        if not isinstance(data, dict):
+            logger.error("获取%s失败 - 响应不是 JSON 对象: %s", what, _error_body(response))
+            return None, None
+        return data, response.headers.get("ETag")
+
+    except httpx.RequestError as e:
+        logger.error("请求%s时发生网络错误: %s", what, e)
+        return None, None
+    except Exception as e:
+        logger.error("获取%s时发生未知错误: %s", what, e)
+        return None, None
+
+
+# 城市位置信息：(LocationID, 纬度, 经度)，经纬度已格式化为最多两位小数；
+# 一次 GeoAPI 查询同时得到三者，LocationID 与经纬度查询共用同一缓存条目
+CityInfo = Tuple[str, str, str]
+
+# 城市位置查询缓存：casefold 后的城市名 -> (写入时间, 城市位置信息)
+_LOC_CACHE: Dict[str, Tuple[float, CityInfo]] = {}
+LOC_CACHE_MAXSIZE = 1024  # 城市位置缓存最大条目数，超出时淘汰最早写入的条目
+_LOC_CACHE_LOCK = threading.Lock()
+# 预置城市位置：casefold 后的城市名 -> 城市位置信息，不会过期
+_SEED_LOCATIONS: Dict[str, CityInfo] = {}
+# 进行中的城市位置查询：缓存键 -> 查询任务，同一城市的并发查询共享同一任务
+_LOC_INFLIGHT: Dict[str, "asyncio.Future[Optional[CityInfo]]"] = {}
+
+
+def _norm(value: Any) -> str:
+    """去除参数首尾空白，非字符串先转换为字符串，未提供时返回空字符串"""
+    if value is None:
+        return ""
+    if type(value) is str:
+        return value.strip()
+    return str(value).strip()
+
+
+async def _no_lookup() -> Optional[str]:
+    """无需查询时传给 asyncio.gather 的占位协程"""
+    return None
+
+
+async def _get_city_location(city: str) -> Optional[str]:
     """
     根据城市名称获取LocationID
 
+    查询结果会在进程内缓存 HEFENG_GEO_CACHE_TTL 秒，并写入持久化缓存保留30天，
+    服务重启后无需重新请求 GeoAPI
+
     Args:
         city: 城市名称，如 '北京'、'上海' 等
 
@@ -124,49 +714,395 @@ def _get_city_location(city: str, location: bool = False) -> Optional[str]:
     Raises:
         无，所有异常都会被捕获并记录日志
     """
-    url = f"https://{api_host}/geo/v2/city/lookup"
+    info = await _get_city_info(city)
+    return info[0] if info is not None else None
+
+
+async def _get_city_latlon(city: str) -> Optional[Tuple[str, str]]:
+    """
+    根据城市名称获取 (纬度, 经度)，已格式化为最多两位小数，缓存策略同 _get_city_location
+    """
+    info = await _get_city_info(city)
+    return (info[1], info[2]) if info is not None else None
+
+
+async def _get_city_info(city: str) -> Optional[CityInfo]:
+    """
+    根据城市名称获取 (LocationID, 纬度, 经度)，缓存策略同 _get_city_location
+    """
+    # 缓存键忽略大小写，使 "Beijing" 与 "beijing" 命中同一条目
+    key = city.casefold()
+    seeded = _SEED_LOCATIONS.get(key)
+    if seeded is not None:
+        return seeded
+
+    cached = _LOC_CACHE.get(key)
+    if cached is not None and time.monotonic() - cached[0] < geo_cache_ttl:
+        return cached[1]
+
+    return await _single_flight(_LOC_INFLIGHT, key, lambda: _load_city_info(city, key))
+
+
+async def _load_city_info(city: str, key: str) -> Optional[CityInfo]:
+    """
+    依次查询持久化缓存和 GeoAPI 并写入缓存，key 为缓存键
+    """
+    if geo_cache_ttl <= 0:
+        return await _fetch_city_info(city)
+
+    disk_cache = _get_disk_cache()
+    disk_key = ("geo", key)
+    result: Optional[CityInfo] = None
+    if disk_cache is not None:
+        try:
+            result = disk_cache.get(disk_key)
+        except Exception as e:
+            logger.warning("读取城市位置持久化缓存失败: %s", e)
+
+    if result is None:
+        result = await _fetch_city_info(city)
+        if result is not None and disk_cache is not None:
+            try:
+                disk_cache.set(disk_key, result, expire=GEO_DISK_CACHE_TTL)
+            except Exception as e:
+                logger.warning("写入城市位置持久化缓存失败: %s", e)
+
+    if result is not None:
+        with _LOC_CACHE_LOCK:
+            _LOC_CACHE.pop(key, None)
+            if len(_LOC_CACHE) >= LOC_CACHE_MAXSIZE:
+                del _LOC_CACHE[next(iter(_LOC_CACHE))]
+            _LOC_CACHE[key] = (time.monotonic(), result)
+    return result
+
+
+async def _fetch_city_info(city: str) -> Optional[CityInfo]:
+    """
+    请求 GeoAPI 查询城市位置，返回值同 _get_city_info
+    """
+    data = await _request_json(_PATH_LOOKUP, {"location": city}, "城市位置信息")
+    if data is None:
+        return None
+    if not data.get("location"):
+        logger.warning("未找到城市 '%s' 的位置信息", city)
+        return None
 
     try:
-        response = httpx.get(url, headers=auth_header, params={"location": city})
+        first = data["location"][0]
+        location_id = first["id"]
+        lat = _format_coord(first["lat"])
+        lon = _format_coord(first["lon"])
+    except (KeyError, TypeError, ValueError) as e:
+        logger.error("解析城市位置信息时发生错误: %s", e)
+        return None
+
+    logger.info(
+        "成功获取城市 '%s' 的位置信息: LocationID %s, 经纬度 %s,%s",
+        city,
+        location_id,
+        lat,
+        lon,
+    )
+    return location_id, lat, lon
 
-        if response.status_code != 200:
-            logger.error(
-                f"查询城市位置失败 - 状态码: {response.status_code}, 响应: {response.text}"
-            )
-            return None
 
-        data = response.json()
-        if data and data.get("location") and len(data["location"]) > 0:
-            location_id = data["location"][0]["id"]
-            if location:
-                # 如果需要返回经纬度信息
-                lat_value = float(data["location"][0]["lat"])
-                lon_value = float(data["location"][0]["lon"])
-                formatted_lat = f"{lat_value:.2f}"
-                formatted_lon = f"{lon_value:.2f}"
-
-                location_lat_lon = formatted_lat + "," + formatted_lon
-                logger.info(
-                    f"成功获取城市 '{city}' 的经纬度: {location_lat_lon} (lat: {formatted_lat}, lon: {formatted_lon})"
+# 持久化缓存，首次使用时打开；目录不可用时为None，仅使用网络请求
+_DISK_CACHE: Optional[diskcache.Cache] = None
+_disk_cache_failed = False
+
+
+def _get_disk_cache() -> Optional[diskcache.Cache]:
+    """获取持久化缓存，打开失败时记录警告并返回None"""
+    global _DISK_CACHE, _disk_cache_failed
+    if _DISK_CACHE is None and not _disk_cache_failed:
+        try:
+            _DISK_CACHE = diskcache.Cache(cache_dir)
+        except Exception as e:
+            logger.warning("无法打开持久化缓存目录 %s，将不使用磁盘缓存: %s", cache_dir, e)
+            _disk_cache_failed = True
+    return _DISK_CACHE
+
+
+def _format_coord(value: str) -> str:
+    """
+    将单个经度或纬度格式化为最多两位小数
+
+    GeoAPI 返回的坐标通常已满足精度要求，此时直接使用原字符串，避免浮点数往返转换
+    """
+    if _COORD_RE.fullmatch(value):
+        return value
+    return f"{float(value):.2f}"
+
+
+@functools.lru_cache(maxsize=4096)
+def _validate_coord_pair(
+    value: str, lat_first: bool = False
+) -> Optional[Tuple[str, str]]:
+    """
+    校验坐标字符串并将两个分量分别规范化为两位小数
+
+    同一坐标常被反复查询，因此缓存解析结果
+
+    Args:
+        value: 坐标字符串，默认为 "经度,纬度"
+        lat_first: 为 True 时按 "纬度,经度" 解析
+
+    Returns:
+        与输入顺序一致的 (第一个分量, 第二个分量)，无法解析或超出有效范围时返回None
+    """
+    # 恰好包含一个逗号；按下标切片，避免 split 生成列表
+    i = value.find(",")
+    if i < 0 or value.find(",", i + 1) >= 0:
+        return None
+    try:
+        first = float(value[:i])
+        second = float(value[i + 1 :])
+    except ValueError:
+        return None
+    lat, lon = (first, second) if lat_first else (second, first)
+    if not (-180 <= lon <= 180) or not (-90 <= lat <= 90):
+        return None
+    return f"{first:.2f}", f"{second:.2f}"
+
+
+@functools.lru_cache(maxsize=4096)
+def _validate_coord(value: str, lat_first: bool = False) -> Optional[str]:
+    """
+    校验坐标字符串并规范化为两位小数格式，参数同 _validate_coord_pair
+
+    Returns:
+        与输入顺序一致的规范化坐标字符串，无法解析或超出有效范围时返回None
+    """
+    pair = _validate_coord_pair(value, lat_first)
+    if pair is None:
+        return None
+    return f"{pair[0]},{pair[1]}"
+
+
+def _load_seed_locations(path: str) -> None:
+    """
+    从 CSV 文件预置城市位置，文件须包含表头 city,id,lat,lon
+
+    缺少字段或坐标无效的行会被跳过；读取失败时记录警告，不影响服务启动
+    """
+    count = 0
+    try:
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            for row in csv.DictReader(f):
+                name = _norm(row.get("city"))
+                location_id = _norm(row.get("id"))
+                lat_lon = _validate_coord_pair(
+                    f"{_norm(row.get('lat'))},{_norm(row.get('lon'))}", lat_first=True
                 )
+                if not name or not location_id or lat_lon is None:
+                    continue
+                _SEED_LOCATIONS[name.casefold()] = (location_id, *lat_lon)
+                count += 1
+    except (OSError, csv.Error, UnicodeDecodeError) as e:
+        logger.warning("读取预置城市位置文件 %s 失败: %s", path, e)
+        return
+    logger.info("已从 %s 预置 %s 个城市位置", path, count)
+
+
+if city_csv_path:
+    _load_seed_locations(city_csv_path)
 
-                return location_lat_lon
-            logger.info(f"成功获取城市 '{city}' 的LocationID: {location_id}")
-            return location_id
+
+# 字段路径语法：以 . 分隔的键名，列表可用 [*] 展开或 [n] 取下标，如 "daily[*].tempMax"
+_FIELD_PATH_RE = re.compile(r"[^.\[\]]+(?:\[(?:\*|\d+)\])*(?:\.[^.\[\]]+(?:\[(?:\*|\d+)\])*)*")
+_FIELD_STEP_RE = re.compile(r"([^.\[\]]+)|\[(\*|\d+)\]")
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_field_path(expr: str) -> Optional[Tuple[Any, ...]]:
+    """
+    将字段路径编译为取值步骤，同一表达式只解析一次
+
+    Returns:
+        步骤元组：str 为字典键，int 为列表下标，None 表示展开整个列表；
+        表达式无效时返回None
+    """
+    if not _FIELD_PATH_RE.fullmatch(expr):
+        return None
+    steps: List[Any] = []
+    for key, index in _FIELD_STEP_RE.findall(expr):
+        if key:
+            steps.append(key)
+        elif index == "*":
+            steps.append(None)
         else:
-            logger.warning(f"未找到城市 '{city}' 的位置信息")
+            steps.append(int(index))
+    return tuple(steps)
+
+
+def _extract_field(data: Any, steps: Tuple[Any, ...]) -> List[Any]:
+    """按编译后的步骤从 JSON 数据中取值，返回所有匹配的值"""
+    nodes = [data]
+    for step in steps:
+        matched: List[Any] = []
+        for node in nodes:
+            if step is None:
+                if isinstance(node, list):
+                    matched.extend(node)
+            elif isinstance(step, int):
+                if isinstance(node, list) and step < len(node):
+                    matched.append(node[step])
+            elif isinstance(node, dict) and step in node:
+                matched.append(node[step])
+        nodes = matched
+    return nodes
+
+
+def _parse_fields(fields: Optional[str]) -> Optional[Dict[str, Tuple[Any, ...]]]:
+    """
+    解析以逗号分隔的字段路径列表
+
+    Returns:
+        字段路径 -> 编译后的步骤；未指定字段时返回空字典，存在无效路径时返回None
+    """
+    compiled: Dict[str, Tuple[Any, ...]] = {}
+    for expr in (fields or "").split(","):
+        expr = expr.strip()
+        if not expr:
+            continue
+        steps = _compile_field_path(expr)
+        if steps is None:
+            logger.error("无效的字段路径: %s，示例: daily[*].tempMax", expr)
             return None
+        compiled[expr] = steps
+    return compiled
 
-    except httpx.RequestError as e:
-        logger.error(f"请求城市位置信息时发生网络错误: {e}")
+
+def _select_fields(
+    data: Optional[Dict[str, Any]], compiled: Dict[str, Tuple[Any, ...]]
+) -> Optional[Dict[str, Any]]:
+    """
+    仅保留指定字段，减少返回给 MCP 客户端的数据量
+
+    业务状态码不为 200 或未指定字段时原样返回
+    """
+    if not compiled or data is None or data.get("code") != "200":
+        return data
+    selected: Dict[str, Any] = {"code": data["code"]}
+    for expr, steps in compiled.items():
+        selected[expr] = _extract_field(data, steps)
+    return selected
+
+
+def _parse_yyyymmdd(value: str) -> Optional[date_type]:
+    """
+    解析 yyyyMMdd 格式的日期，格式固定，无需使用较慢的 strptime
+
+    Returns:
+        解析得到的日期，格式错误或日期无效时返回None
+    """
+    if not isinstance(value, str) or len(value) != 8:
         return None
-    except Exception as e:
-        logger.error(f"查询城市位置时发生未知错误: {e}")
+    if not value.isascii() or not value.isdigit():
+        return None
+    try:
+        return date_type(int(value[:4]), int(value[4:6]), int(value[6:8]))
+    except ValueError:
         return None
 
 
+def _recent_dates(days: int) -> List[str]:
+    """
+    以北京时间为基准，生成从 today-days 到 yesterday 的 yyyyMMdd 日期列表
+    """
+    today = datetime.now(tz=CST).date()
+    return [
+        (today - timedelta(days=offset)).strftime("%Y%m%d")
+        for offset in range(days, 0, -1)
+    ]
+
+
+async def _fetch_history_day(path: str, params: Dict[str, str], what: str) -> Dict[str, Any]:
+    """
+    请求单日的历史数据
+
+    Args:
+        path: 历史数据接口路径
+        params: 请求参数，须包含 date
+        what: 数据名称，用于日志
+
+    Returns:
+        接口返回的 JSON 数据；失败时返回包含 error 字段的字典
+    """
+    target_date = params["date"]
+
+    # 历史数据一经生成便不再变化，优先读取持久化缓存
+    disk_cache = _get_disk_cache()
+    key = (path, tuple(sorted(params.items())))
+    if disk_cache is not None:
+        try:
+            cached = disk_cache.get(key)
+        except Exception as e:
+            logger.warning("读取%s持久化缓存失败 (%s): %s", what, target_date, e)
+            cached = None
+        if cached is not None:
+            return cached
+
+    try:
+        response = await _get_with_retry(path, params)
+
+        if response.status_code != 200:
+            body = _error_body(response)
+            logger.error(
+                "获取%s失败 (%s) - 状态码: %s, 响应: %s",
+                what,
+                target_date,
+                response.status_code,
+                body,
+            )
+            return {"error": body, "status_code": response.status_code}
+
+        data = _decode(response)
+        # 仅缓存成功的响应（业务状态码为 200）
+        if disk_cache is not None and data.get("code") == "200":
+            try:
+                disk_cache.set(key, data)
+            except Exception as e:
+                logger.warning("写入%s持久化缓存失败 (%s): %s", what, target_date, e)
+        return data
+
+    except httpx.RequestError as e:
+        logger.error("请求%s时发生网络错误 (%s): %s", what, target_date, e)
+        return {"error": str(e)}
+    except Exception as e:
+        logger.error("获取%s时发生未知错误 (%s): %s", what, target_date, e)
+        return {"error": str(e)}
+
+
+async def _fetch_history_days(
+    path: str, all_params: List[Dict[str, str]], what: str
+) -> Dict[str, Any]:
+    """
+    并发请求多日的历史数据
+
+    Args:
+        path: 历史数据接口路径
+        all_params: 每日的请求参数，须包含 date
+        what: 数据名称，用于日志
+
+    Returns:
+        字典，键为 yyyyMMdd 日期，值为接口返回的 JSON 数据或错误信息
+    """
+    # 各日期的请求相互独立，并发发出以缩短总耗时
+    semaphore = asyncio.Semaphore(HISTORY_MAX_CONCURRENCY)
+
+    async def fetch(params: Dict[str, str]) -> Dict[str, Any]:
+        async with semaphore:
+            return await _fetch_history_day(path, params, what)
+
+    responses = await asyncio.gather(*(fetch(params) for params in all_params))
+    return {params["date"]: data for params, data in zip(all_params, responses)}
+
+
 @mcp.tool()
-def get_weather(city: str, days: str = "3d") -> Optional[Dict[str, Any]]:
+async def get_weather(
+    city: str, days: str = "3d", fields: Optional[str] = None
+) -> Optional[Dict[str, Any]]:
     """
     获取指定城市的天气预报
 
@@ -175,53 +1111,46 @@ def get_weather(city: str, days: str = "3d") -> Optional[Dict[str, Any]]:
     Args:
         city: 城市名称，支持中英文，如 '北京'、'上海'、'Beijing' 等
         days: 预报天数，支持 "3d"(默认)、"7d"、"10d"、"15d"、"30d"
+        fields: 可选，只返回指定字段，多个路径以逗号分隔，
+                如 "daily[*].fxDate,daily[*].tempMax"
 
     Returns:
-        包含指定天数天气预报的JSON数据，如果查询失败则返回None
+        包含指定天数天气预报的JSON数据，如果查询失败则返回None；
+        指定 fields 时返回 {"code": ..., 字段路径: 匹配值列表}
     """
-    if not city or not city.strip():
+    city = _norm(city)
+    if not city:
         logger.error("城市名称不能为空")
         return None
 
-    city = city.strip()
-
     # 验证days参数
-    valid_days = ["3d", "7d", "10d", "15d", "30d"]
-    if days not in valid_days:
-        logger.error(f"无效的预报天数参数: {days}，支持的值: {', '.join(valid_days)}")
+    if days not in _VALID_FORECAST_DAYS:
+        logger.error("无效的预报天数参数: %s，支持的值: 3d, 7d, 10d, 15d, 30d", days)
+        return None
+
+    compiled_fields = _parse_fields(fields)
+    if compiled_fields is None:
         return None
 
     # 获取城市LocationID
-    location_id = _get_city_location(city)
+    location_id = await _get_city_location(city)
     if not location_id:
-        logger.error(f"无法获取城市 '{city}' 的位置信息")
+        logger.error("无法获取城市 '%s' 的位置信息", city)
         return None
 
-    url = f"https://{api_host}/v7/weather/{days}?location={location_id}"
+    path = _WEATHER_DAYS_PATHS[days]
+    params = {"location": location_id}
 
-    try:
-        response = httpx.get(url=url, headers=auth_header)
-
-        if response.status_code != 200:
-            logger.error(
-                f"获取天气数据失败 - 状态码: {response.status_code}, 响应: {response.text}"
-            )
-            return None
-
-        weather_data = response.json()
-        logger.info(f"成功获取城市 '{city}' 的天气预报数据")
-        return weather_data
-
-    except httpx.RequestError as e:
-        logger.error(f"请求天气数据时发生网络错误: {e}")
-        return None
-    except Exception as e:
-        logger.error(f"获取天气数据时发生未知错误: {e}")
-        return None
+    weather_data = await _request_json(path, params, "天气数据")
+    if weather_data is not None:
+        logger.info("成功获取城市 '%s' 的天气预报数据", city)
+    return _select_fields(weather_data, compiled_fields)
 
 
 @mcp.tool()
-def get_warning(city: str) -> Optional[Dict[str, Any]]:
+async def get_warning(
+    city: str, fields: Optional[str] = None
+) -> Optional[Dict[str, Any]]:
     """
     获取指定城市的当前气象预警信息
 
@@ -229,9 +1158,11 @@ def get_warning(city: str) -> Optional[Dict[str, Any]]:
 
     Args:
         city: 城市名称，支持中英文，如 '北京'、'上海'、'Beijing' 等
+        fields: 可选，只返回指定字段，多个路径以逗号分隔，如 "warning[*].title"
 
     Returns:
-        包含当前气象预警信息的JSON数据，如果查询失败则返回None
+        包含当前气象预警信息的JSON数据，如果查询失败则返回None；
+        指定 fields 时返回 {"code": ..., 字段路径: 匹配值列表}
 
     Examples:
         >>> get_warning("北京")
@@ -252,44 +1183,33 @@ def get_warning(city: str) -> Optional[Dict[str, Any]]:
             ]
         }
     """
-    if not city or not city.strip():
+    city = _norm(city)
+    if not city:
         logger.error("城市名称不能为空")
         return None
-
-    city = city.strip()
     lang = "zh"  # 使用中文语言
 
+    compiled_fields = _parse_fields(fields)
+    if compiled_fields is None:
+        return None
+
     # 获取城市LocationID
-    location_id = _get_city_location(city)
+    location_id = await _get_city_location(city)
     if not location_id:
-        logger.error(f"无法获取城市 '{city}' 的位置信息")
+        logger.error("无法获取城市 '%s' 的位置信息", city)
         return None
 
-    url = f"https://{api_host}/v7/warning/now?location={location_id}&lang={lang}"
+    path = _PATH_WARNING
+    params = {"location": location_id, "lang": lang}
 
-    try:
-        response = httpx.get(url, headers=auth_header)
-
-        if response.status_code != 200:
-            logger.error(
-                f"获取预警数据失败 - 状态码: {response.status_code}, 响应: {response.text}"
-            )
-            return None
-
-        warning_data = response.json()
-        logger.info(f"成功获取城市 '{city}' 的气象预警数据")
-        return warning_data
-
-    except httpx.RequestError as e:
-        logger.error(f"请求预警数据时发生网络错误: {e}")
-        return None
-    except Exception as e:
-        logger.error(f"获取预警数据时发生未知错误: {e}")
-        return None
+    warning_data = await _request_json(path, params, "预警数据")
+    if warning_data is not None:
+        logger.info("成功获取城市 '%s' 的气象预警数据", city)
+    return _select_fields(warning_data, compiled_fields)
 
 
 @mcp.tool()
-def get_indices(
+async def get_indices(
     city: str,
     days: str = "1d",
     index_types: str = "1,2,3,4,5,6,7,8,9,10,11,12,13,14,15,16",
@@ -312,56 +1232,39 @@ def get_indices(
     Returns:
         包含天气生活指数预报的JSON数据，如果查询失败则返回None
     """
-    if not city or not city.strip():
+    city = _norm(city)
+    if not city:
         logger.error("城市名称不能为空")
         return None
 
-    city = city.strip()
-
     # 验证days参数
-    if days not in ["1d", "3d"]:
-        logger.error(f"无效的预报天数参数: {days}，支持的值: 1d, 3d")
+    if days not in _VALID_INDEX_DAYS:
+        logger.error("无效的预报天数参数: %s，支持的值: 1d, 3d", days)
         return None
 
     # 验证index_types参数
-    if not index_types or not index_types.strip():
+    index_types = _norm(index_types)
+    if not index_types:
         logger.error("指数类型参数不能为空")
         return None
 
-    index_types = index_types.strip()
-
     # 获取城市LocationID
-    location_id = _get_city_location(city)
+    location_id = await _get_city_location(city)
     if not location_id:
-        logger.error(f"无法获取城市 '{city}' 的位置信息")
+        logger.error("无法获取城市 '%s' 的位置信息", city)
         return None
 
-    url = f"https://{api_host}/v7/indices/{days}"
+    path = _INDICES_DAYS_PATHS[days]
     params = {"location": location_id, "type": index_types, "lang": "zh"}
 
-    try:
-        response = httpx.get(url, headers=auth_header, params=params)
-
-        if response.status_code != 200:
-            logger.error(
-                f"获取生活指数数据失败 - 状态码: {response.status_code}, 响应: {response.text}"
-            )
-            return None
-
-        indices_data = response.json()
-        logger.info(f"成功获取城市 '{city}' 的生活指数预报数据")
-        return indices_data
-
-    except httpx.RequestError as e:
-        logger.error(f"请求生活指数数据时发生网络错误: {e}")
-        return None
-    except Exception as e:
-        logger.error(f"获取生活指数数据时发生未知错误: {e}")
-        return None
+    indices_data = await _request_json(path, params, "生活指数数据")
+    if indices_data is not None:
+        logger.info("成功获取城市 '%s' 的生活指数预报数据", city)
+    return indices_data
 
 
 @mcp.tool()
-def get_air_quality(city: str) -> Optional[Dict[str, Any]]:
+async def get_air_quality(city: str) -> Optional[Dict[str, Any]]:
     """
     获取指定地点的实时空气质量数据
 
@@ -373,44 +1276,28 @@ def get_air_quality(city: str) -> Optional[Dict[str, Any]]:
     Returns:
         包含实时空气质量数据的JSON数据，如果查询失败则返回None
     """
-    location_lat_lon = _get_city_location(city, location=True)
-    if not location_lat_lon:
-        logger.error(f"无法获取城市 '{city}' 的位置信息")
+    city = _norm(city)
+    if not city:
+        logger.error("城市名称不能为空")
         return None
 
-    # 分割经纬度
-    try:
-        lat, lon = location_lat_lon.split(",")
-    except ValueError:
-        logger.error(f"无法解析城市 '{city}' 的经纬度信息: {location_lat_lon}")
+    lat_lon = await _get_city_latlon(city)
+    if lat_lon is None:
+        logger.error("无法获取城市 '%s' 的位置信息", city)
         return None
 
-    url = f"https://{api_host}/airquality/v1/current/{lat}/{lon}"
+    lat, lon = lat_lon
+    path = f"{_PATH_AIR}/{lat}/{lon}"
     params = {"lang": "zh"}
 
-    try:
-        response = httpx.get(url, headers=auth_header, params=params)
-
-        if response.status_code != 200:
-            logger.error(
-                f"获取空气质量数据失败 - 状态码: {response.status_code}, 响应: {response.text}"
-            )
-            return None
-
-        air_quality_data = response.json()
-        logger.info(f"成功获取城市 '{city}' 的空气质量数据")
-        return air_quality_data
-
-    except httpx.RequestError as e:
-        logger.error(f"请求空气质量数据时发生网络错误: {e}")
-        return None
-    except Exception as e:
-        logger.error(f"获取空气质量数据时发生未知错误: {e}")
-        return None
+    air_quality_data = await _request_json(path, params, "空气质量数据")
+    if air_quality_data is not None:
+        logger.info("成功获取城市 '%s' 的空气质量数据", city)
+    return air_quality_data
 
 
 @mcp.tool()
-def get_air_quality_history(
+async def get_air_quality_history(
     city: str, days: int = 10, lang: str = "zh"
 ) -> Optional[Dict[str, Any]]:
     """
@@ -424,7 +1311,8 @@ def get_air_quality_history(
     Returns:
         字典，键为 yyyyMMdd 日期，值为接口返回的 JSON 数据或错误信息；查询失败返回 None
     """
-    if not city or not city.strip():
+    city = _norm(city)
+    if not city:
         logger.error("城市名称不能为空")
         return None
 
@@ -432,55 +1320,24 @@ def get_air_quality_history(
         logger.error("参数 days 必须为整数，且范围为 1 到 10")
         return None
 
-    city = city.strip()
-
     # 获取城市 LocationID（历史空气质量接口只支持 LocationID）
-    location_id = _get_city_location(city)
+    location_id = await _get_city_location(city)
     if not location_id:
-        logger.error(f"无法获取城市 '{city}' 的位置信息")
+        logger.error("无法获取城市 '%s' 的位置信息", city)
         return None
 
-    results: Dict[str, Any] = {}
-
-    # 以北京时间为基准，生成从 today-days 到 yesterday 的日期列表
-    # 使用时区感知的 UTC 时间以避免弃用警告
-    beijing_now = datetime.now(tz=timezone.utc) + timedelta(hours=8)
-    for offset in range(days, 0, -1):
-        target_date = (beijing_now - timedelta(days=offset)).strftime("%Y%m%d")
+    all_params = [
+        {"location": location_id, "date": target_date, "lang": lang}
+        for target_date in _recent_dates(days)
+    ]
+    results = await _fetch_history_days(_PATH_AIR_HIST, all_params, "历史空气质量数据")
 
-        url = f"https://{api_host}/v7/historical/air"
-        params = {"location": location_id, "date": target_date, "lang": lang}
-
-        try:
-            response = httpx.get(url, headers=auth_header, params=params)
-
-            if response.status_code != 200:
-                logger.error(
-                    f"获取历史空气质量数据失败 ({target_date}) - 状态码: {response.status_code}, 响应: {response.text}"
-                )
-                results[target_date] = {
-                    "error": response.text,
-                    "status_code": response.status_code,
-                }
-            else:
-                results[target_date] = response.json()
-
-            # 小延迟以降低并发请求压力
-            time.sleep(0.1)
-
-        except httpx.RequestError as e:
-            logger.error(f"请求历史空气质量数据时发生网络错误 ({target_date}): {e}")
-            results[target_date] = {"error": str(e)}
-        except Exception as e:
-            logger.error(f"获取历史空气质量数据时发生未知错误 ({target_date}): {e}")
-            results[target_date] = {"error": str(e)}
-
-    logger.info(f"成功获取城市 '{city}' 的历史空气质量数据（最近 {days} 天）")
+    logger.info("成功获取城市 '%s' 的历史空气质量数据（最近 %s 天）", city, days)
     return results
 
 
 @mcp.tool()
-def get_weather_history(
+async def get_weather_history(
     *,
     location: Optional[str] = None,
     city: Optional[str] = None,
@@ -506,7 +1363,9 @@ def get_weather_history(
         字典，键为 yyyyMMdd 日期，值为接口返回的 JSON 数据或错误信息；查询失败返回 None
     """
     # 接受 location（LocationID 或 "lon,lat"）或 city 两种方式之一
-    if (not location or not str(location).strip()) and (not city or not city.strip()):
+    city = _norm(city)
+    loc_value = _norm(location)
+    if not loc_value and not city:
         logger.error("必须提供 location 或 city 其中之一")
         return None
 
@@ -514,22 +1373,19 @@ def get_weather_history(
         logger.error("参数 days 必须为整数，且范围为 1 到 10")
         return None
 
-    if unit not in {"m", "i"}:
+    if unit not in _VALID_UNITS:
         logger.error("无效的单位参数 unit: 应为 'm' 或 'i'")
         return None
 
     # 解析并准备 location_id（历史天气接口只支持 LocationID）
     location_id: Optional[str] = None
 
-    loc_value = (
-        location.strip() if isinstance(location, str) and location.strip() else None
-    )
     if loc_value:
         # 如果传入的是经纬度（含逗号），尝试通过 Geo API 解析为 LocationID
         if "," in loc_value:
-            resolved = _get_city_location(loc_value)
+            resolved = await _get_city_location(loc_value)
             if not resolved:
-                logger.error(f"无法通过经纬度解析 LocationID: {loc_value}")
+                logger.error("无法通过经纬度解析 LocationID: %s", loc_value)
                 return None
             location_id = resolved
         else:
@@ -537,63 +1393,29 @@ def get_weather_history(
             location_id = loc_value
     else:
         # 使用 city 名称解析 LocationID
-        city = city.strip() if city else ""
-        location_id = _get_city_location(city)
+        location_id = await _get_city_location(city)
         if not location_id:
-            logger.error(f"无法获取城市 '{city}' 的位置信息")
+            logger.error("无法获取城市 '%s' 的位置信息", city)
             return None
 
-    results: Dict[str, Any] = {}
+    all_params = [
+        {"location": location_id, "date": target_date, "lang": lang, "unit": unit}
+        for target_date in _recent_dates(days)
+    ]
+    results = await _fetch_history_days(_PATH_WEATHER_HIST, all_params, "历史天气数据")
 
-    # 以北京时间为基准，生成从 today-days 到 yesterday 的日期列表
-    # 使用时区感知的 UTC 时间以避免弃用警告
-    beijing_now = datetime.now(timezone.utc) + timedelta(hours=8)
-    for offset in range(days, 0, -1):
-        target_date = (beijing_now - timedelta(days=offset)).strftime("%Y%m%d")
-
-        url = f"https://{api_host}/v7/historical/weather"
-        params = {
-            "location": location_id,
-            "date": target_date,
-            "lang": lang,
-            "unit": unit,
-        }
-
-        try:
-            response = httpx.get(url, headers=auth_header, params=params)
-
-            if response.status_code != 200:
-                logger.error(
-                    f"获取历史天气数据失败 ({target_date}) - 状态码: {response.status_code}, 响应: {response.text}"
-                )
-                results[target_date] = {
-                    "error": response.text,
-                    "status_code": response.status_code,
-                }
-            else:
-                results[target_date] = response.json()
-
-            # 小延迟以降低并发请求压力
-            time.sleep(0.1)
-
-        except httpx.RequestError as e:
-            logger.error(f"请求历史天气数据时发生网络错误 ({target_date}): {e}")
-            results[target_date] = {"error": str(e)}
-        except Exception as e:
-            logger.error(f"获取历史天气数据时发生未知错误 ({target_date}): {e}")
-            results[target_date] = {"error": str(e)}
-
-    logger.info(f"成功获取城市 '{city}' 的历史天气数据（最近 {days} 天）")
+    logger.info("成功获取城市 '%s' 的历史天气数据（最近 %s 天）", city, days)
     return results
 
 
 @mcp.tool()
-def get_hourly_weather(
+async def get_hourly_weather(
     hours: str = "24h",
     location: Optional[str] = None,
     city: Optional[str] = None,
     lang: str = "zh",
     unit: str = "m",
+    fields: Optional[str] = None,
 ) -> Optional[Dict[str, Any]]:
     """
     获取指定地点未来 24-168 小时的逐小时天气预报
@@ -606,62 +1428,52 @@ def get_hourly_weather(
         city: 城市名称（当未提供 location 时使用此参数自动解析 LocationID）
         lang: 多语言代码，默认 "zh"
         unit: 单位，"m" 公制（默认）或 "i" 英制
+        fields: 可选，只返回指定字段，多个路径以逗号分隔，
+                如 "hourly[*].fxTime,hourly[*].temp"
 
     Returns:
-        包含逐小时天气预报的 JSON 数据，如果失败返回 None
+        包含逐小时天气预报的 JSON 数据，如果失败返回 None；
+        指定 fields 时返回 {"code": ..., 字段路径: 匹配值列表}
     """
     # 校验 hours 参数
-    valid_hours = {"24h", "72h", "168h"}
-    if hours not in valid_hours:
-        logger.error(
-            f"无效的 hours 参数: {hours}，支持的值: {', '.join(sorted(valid_hours))}"
-        )
+    if hours not in _VALID_HOURS:
+        logger.error("无效的 hours 参数: %s，支持的值: 24h, 72h, 168h", hours)
         return None
 
     # 校验 unit 参数
-    if unit not in {"m", "i"}:
-        logger.error(f"无效的单位参数 unit: {unit}，支持的值: m, i")
+    if unit not in _VALID_UNITS:
+        logger.error("无效的单位参数 unit: %s，支持的值: m, i", unit)
+        return None
+
+    compiled_fields = _parse_fields(fields)
+    if compiled_fields is None:
         return None
 
     # 准备 location 值
-    loc_value: Optional[str] = location.strip() if isinstance(location, str) else None
+    loc_value: Optional[str] = _norm(location)
     if not loc_value:
-        if not city or not city.strip():
+        city = _norm(city)
+        if not city:
             logger.error("必须提供 location 或 city 其中之一")
             return None
         # 通过城市名解析 LocationID
-        loc_value = _get_city_location(city.strip())
+        loc_value = await _get_city_location(city)
         if not loc_value:
-            logger.error(f"无法获取城市 '{city}' 的位置信息")
+            logger.error("无法获取城市 '%s' 的位置信息", city)
             return None
 
-    url = f"https://{api_host}/v7/weather/{hours}"
+    path = _WEATHER_HOURS_PATHS[hours]
     params = {"location": loc_value, "lang": lang, "unit": unit}
 
-    try:
-        response = httpx.get(url, headers=auth_header, params=params)
-
-        if response.status_code != 200:
-            logger.error(
-                f"获取逐小时天气数据失败 - 状态码: {response.status_code}, 响应: {response.text}"
-            )
-            return None
-
-        hourly_data = response.json()
+    hourly_data = await _request_json(path, params, "逐小时天气数据")
+    if hourly_data is not None:
         who = city or loc_value
-        logger.info(f"成功获取 '{who}' 的逐小时天气预报数据（{hours}）")
-        return hourly_data
-
-    except httpx.RequestError as e:
-        logger.error(f"请求逐小时天气数据时发生网络错误: {e}")
-        return None
-    except Exception as e:
-        logger.error(f"获取逐小时天气数据时发生未知错误: {e}")
-        return None
+        logger.info("成功获取 '%s' 的逐小时天气预报数据（%s）", who, hours)
+    return _select_fields(hourly_data, compiled_fields)
 
 
 @mcp.tool()
-def get_weather_now(
+async def get_weather_now(
     location: Optional[str] = None,
     city: Optional[str] = None,
     lang: str = "zh",
@@ -683,48 +1495,140 @@ def get_weather_now(
         包含实况天气的 JSON 数据，如果失败返回 None
     """
     # 校验 unit 参数
-    if unit not in {"m", "i"}:
-        logger.error(f"无效的单位参数 unit: {unit}，支持的值: m, i")
+    if unit not in _VALID_UNITS:
+        logger.error("无效的单位参数 unit: %s，支持的值: m, i", unit)
         return None
 
     # 准备 location 值
-    loc_value: Optional[str] = location.strip() if isinstance(location, str) else None
+    loc_value: Optional[str] = _norm(location)
     if not loc_value:
-        if not city or not city.strip():
+        city = _norm(city)
+        if not city:
             logger.error("必须提供 location 或 city 其中之一")
             return None
         # 通过城市名解析 LocationID
-        loc_value = _get_city_location(city.strip())
+        loc_value = await _get_city_location(city)
         if not loc_value:
-            logger.error(f"无法获取城市 '{city}' 的位置信息")
+            logger.error("无法获取城市 '%s' 的位置信息", city)
             return None
 
-    url = f"https://{api_host}/v7/weather/now"
+    path = _PATH_WEATHER_NOW
     params = {"location": loc_value, "lang": lang, "unit": unit}
 
-    try:
-        response = httpx.get(url, headers=auth_header, params=params)
-        if response.status_code != 200:
-            logger.error(
-                f"获取实况天气数据失败 - 状态码: {response.status_code}, 响应: {response.text}"
-            )
-            return None
-
-        now_data = response.json()
+    now_data = await _request_json(path, params, "实况天气数据")
+    if now_data is not None:
         who = city or loc_value
-        logger.info(f"成功获取 '{who}' 的实况天气数据")
-        return now_data
+        logger.info("成功获取 '%s' 的实况天气数据", who)
+    return now_data
 
-    except httpx.RequestError as e:
-        logger.error(f"请求实况天气数据时发生网络错误: {e}")
+
+@mcp.tool()
+async def get_weather_now_batch(
+    cities: List[str], lang: str = "zh", unit: str = "m"
+) -> Optional[Dict[str, Any]]:
+    """
+    批量获取多个城市的实时天气数据（/v7/weather/now）
+
+    各城市的查询并发进行，总耗时约等于单次查询耗时
+
+    Args:
+        cities: 城市名称列表，支持中英文，如 ["北京", "上海", "Beijing"]
+        lang: 多语言代码，默认 "zh"
+        unit: 单位，"m" 公制（默认）或 "i" 英制
+
+    Returns:
+        字典，键为城市名称，值为该城市的实况天气 JSON 数据（查询失败时为 None）；
+        参数无效时返回 None
+    """
+    names = [name for name in (_norm(c) for c in cities or []) if name]
+    if not names:
+        logger.error("cities 参数不能为空")
         return None
-    except Exception as e:
-        logger.error(f"获取实况天气数据时发生未知错误: {e}")
+
+    if unit not in _VALID_UNITS:
+        logger.error("无效的单位参数 unit: %s，支持的值: m, i", unit)
+        return None
+
+    return await _batch_by_city(
+        names,
+        lambda name: get_weather_now(city=name, lang=lang, unit=unit),
+        "实况天气数据",
+    )
+
+
+@mcp.tool()
+async def get_weather_batch(
+    cities: List[str], days: str = "3d"
+) -> Optional[Dict[str, Any]]:
+    """
+    批量获取多个城市的天气预报
+
+    各城市的位置查询与预报请求并发进行，总耗时约等于单个城市的查询耗时
+
+    Args:
+        cities: 城市名称列表，支持中英文，如 ["北京", "上海", "Beijing"]
+        days: 预报天数，支持 "3d"(默认)、"7d"、"10d"、"15d"、"30d"
+
+    Returns:
+        字典，键为城市名称，值为该城市的天气预报 JSON 数据（查询失败时为 None）；
+        参数无效时返回 None
+    """
+    names = [name for name in (_norm(c) for c in cities or []) if name]
+    if not names:
+        logger.error("cities 参数不能为空")
         return None
 
+    if days not in _VALID_FORECAST_DAYS:
+        logger.error("无效的预报天数参数: %s，支持的值: 3d, 7d, 10d, 15d, 30d", days)
+        return None
+
+    return await _batch_by_city(
+        names, lambda name: get_weather(city=name, days=days), "天气预报数据"
+    )
+
+
+async def _batch_by_city(
+    names: List[str],
+    fetch: Callable[[str], Awaitable[Optional[Dict[str, Any]]]],
+    what: str,
+) -> Dict[str, Any]:
+    """
+    对多个城市并发执行同一查询，单个城市失败不影响其他城市
+
+    Args:
+        names: 城市名称列表（已去除首尾空白）
+        fetch: 查询单个城市的协程函数
+        what: 数据名称，用于日志
+
+    Returns:
+        字典，键为城市名称（去重并保持顺序），值为查询结果，失败时为 None
+    """
+    # 去重并保持顺序
+    names = list(dict.fromkeys(names))
+    semaphore = asyncio.Semaphore(BATCH_MAX_CONCURRENCY)
+
+    async def run(name: str) -> Optional[Dict[str, Any]]:
+        async with semaphore:
+            return await fetch(name)
+
+    responses = await asyncio.gather(
+        *(run(name) for name in names), return_exceptions=True
+    )
+
+    results: Dict[str, Any] = {}
+    for name, response in zip(names, responses):
+        if isinstance(response, BaseException):
+            logger.error("获取城市 '%s' 的%s时发生未知错误: %s", name, what, response)
+            results[name] = None
+        else:
+            results[name] = response
+
+    logger.info("成功批量获取 %s 个城市的%s", len(names), what)
+    return results
+
 
 @mcp.tool()
-def get_minutely_5m(location: str, lang: str = "zh") -> Optional[Dict[str, Any]]:
+async def get_minutely_5m(location: str, lang: str = "zh") -> Optional[Dict[str, Any]]:
     """
     获取分钟级降水（近两小时、每5分钟）预报数据
 
@@ -740,46 +1644,37 @@ def get_minutely_5m(location: str, lang: str = "zh") -> Optional[Dict[str, Any]]
     Returns:
         接口返回的 JSON 数据，失败时返回 None
     """
-    if not location or not str(location).strip():
+    loc_value = _norm(location)
+    if not loc_value:
         logger.error("location 参数不能为空，需为经度,纬度（如 116.38,39.91）或城市名")
         return None
 
-    loc_value = str(location).strip()
-
     # 如果传入的不是经纬度（不包含逗号），尝试当作城市名解析为经纬度
     if "," not in loc_value:
-        resolved = _get_city_location(loc_value, location=True)
-        if not resolved:
-            logger.error(f"无法将 '{loc_value}' 解析为经纬度")
+        lat_lon = await _get_city_latlon(loc_value)
+        if lat_lon is None:
+            logger.error("无法将 '%s' 解析为经纬度", loc_value)
             return None
-        loc_value = resolved
-
-    url = f"https://{api_host}/v7/minutely/5m"
-    params = {"location": loc_value, "lang": lang}
-
-    try:
-        response = httpx.get(url, headers=auth_header, params=params)
-
-        if response.status_code != 200:
-            logger.error(
-                f"获取分钟级降水数据失败 - 状态码: {response.status_code}, 响应: {response.text}"
-            )
+        # 接口要求 "经度,纬度" 顺序
+        loc_value = f"{lat_lon[1]},{lat_lon[0]}"
+    else:
+        formatted_loc = _validate_coord(loc_value)
+        if formatted_loc is None:
+            logger.error("无法解析经纬度参数: %s, 期望格式 lon,lat", loc_value)
             return None
+        loc_value = formatted_loc
 
-        minutely_data = response.json()
-        logger.info(f"成功获取 location={loc_value} 的分钟级降水预报数据")
-        return minutely_data
+    path = _PATH_MINUTELY
+    params = {"location": loc_value, "lang": lang}
 
-    except httpx.RequestError as e:
-        logger.error(f"请求分钟级降水数据时发生网络错误: {e}")
-        return None
-    except Exception as e:
-        logger.error(f"获取分钟级降水数据时发生未知错误: {e}")
-        return None
+    minutely_data = await _request_json(path, params, "分钟级降水数据")
+    if minutely_data is not None:
+        logger.info("成功获取 location=%s 的分钟级降水预报数据", loc_value)
+    return minutely_data
 
 
 @mcp.tool()
-def get_astronomy_moon(
+async def get_astronomy_moon(
     location: str, date: str, lang: str = "zh"
 ) -> Optional[Dict[str, Any]]:
     """
@@ -796,74 +1691,56 @@ def get_astronomy_moon(
     Returns:
         接口返回的 JSON 数据，失败时返回 None
     """
-    if not location or not str(location).strip():
+    loc_value = _norm(location)
+    if not loc_value:
         logger.error(
             "location 参数不能为空，需为 LocationID 或 经度,纬度（如 116.41,39.92）或城市名"
         )
         return None
 
-    loc_value = str(location).strip()
-
     # 如果为经纬度，格式化为两位小数
     if "," in loc_value:
-        try:
-            lon_str, lat_str = [s.strip() for s in loc_value.split(",", 1)]
-            lon = float(lon_str)
-            lat = float(lat_str)
-            loc_value = f"{lon:.2f},{lat:.2f}"
-        except Exception:
-            logger.error(f"无法解析经纬度参数: {loc_value}, 期望格式 lon,lat")
+        formatted_loc = _validate_coord(loc_value)
+        if formatted_loc is None:
+            logger.error("无法解析经纬度参数: %s, 期望格式 lon,lat", loc_value)
             return None
+        loc_value = formatted_loc
     else:
         # 如果看起来像 LocationID（全数字），直接使用，否则尝试解析为 LocationID
         if not loc_value.isdigit():
-            resolved = _get_city_location(loc_value)
+            resolved = await _get_city_location(loc_value)
             if not resolved:
-                logger.error(f"无法将 '{loc_value}' 解析为 LocationID")
+                logger.error("无法将 '%s' 解析为 LocationID", loc_value)
                 return None
             loc_value = resolved
 
     # 验证 date 格式并在允许范围内（今天 ~ 今天+60天）
-    try:
-        target_date = datetime.strptime(date, "%Y%m%d").date()
-    except Exception:
+    target_date = _parse_yyyymmdd(date)
+    if target_date is None:
         logger.error("date 参数格式错误，需为 yyyyMMdd，例如 20211120")
         return None
 
-    beijing_today = (datetime.now(timezone.utc) + timedelta(hours=8)).date()
+    beijing_today = datetime.now(tz=CST).date()
     max_date = beijing_today + timedelta(days=60)
     if target_date < beijing_today or target_date > max_date:
         logger.error(
-            f"date 参数超出允许范围：应在 {beijing_today.strftime('%Y%m%d')} 到 {max_date.strftime('%Y%m%d')} 之间"
+            "date 参数超出允许范围：应在 %s 到 %s 之间",
+            beijing_today.strftime('%Y%m%d'),
+            max_date.strftime('%Y%m%d'),
         )
         return None
 
-    url = f"https://{api_host}/v7/astronomy/moon"
+    path = _PATH_ASTRO_MOON
     params = {"location": loc_value, "date": date, "lang": lang}
 
-    try:
-        response = httpx.get(url, headers=auth_header, params=params)
-
-        if response.status_code != 200:
-            logger.error(
-                f"获取月亮天文数据失败 - 状态码: {response.status_code}, 响应: {response.text}"
-            )
-            return None
-
-        moon_data = response.json()
-        logger.info(f"成功获取 location={loc_value} date={date} 的月亮天文数据")
-        return moon_data
-
-    except httpx.RequestError as e:
-        logger.error(f"请求月亮天文数据时发生网络错误: {e}")
-        return None
-    except Exception as e:
-        logger.error(f"获取月亮天文数据时发生未知错误: {e}")
-        return None
+    moon_data = await _request_json(path, params, "月亮天文数据")
+    if moon_data is not None:
+        logger.info("成功获取 location=%s date=%s 的月亮天文数据", loc_value, date)
+    return moon_data
 
 
 @mcp.tool()
-def get_astronomy_sun(
+async def get_astronomy_sun(
     location: str, date: str, lang: str = "zh"
 ) -> Optional[Dict[str, Any]]:
     """
@@ -880,74 +1757,56 @@ def get_astronomy_sun(
     Returns:
         接口返回的 JSON 数据，失败时返回 None
     """
-    if not location or not str(location).strip():
+    loc_value = _norm(location)
+    if not loc_value:
         logger.error(
             "location 参数不能为空，需为 LocationID 或 经度,纬度（如 116.41,39.92）或城市名"
         )
         return None
 
-    loc_value = str(location).strip()
-
     # 如果为经纬度，格式化为两位小数
     if "," in loc_value:
-        try:
-            lon_str, lat_str = [s.strip() for s in loc_value.split(",", 1)]
-            lon = float(lon_str)
-            lat = float(lat_str)
-            loc_value = f"{lon:.2f},{lat:.2f}"
-        except Exception:
-            logger.error(f"无法解析经纬度参数: {loc_value}, 期望格式 lon,lat")
+        formatted_loc = _validate_coord(loc_value)
+        if formatted_loc is None:
+            logger.error("无法解析经纬度参数: %s, 期望格式 lon,lat", loc_value)
             return None
+        loc_value = formatted_loc
     else:
         # 如果看起来像 LocationID（全数字），直接使用，否则尝试解析为 LocationID
         if not loc_value.isdigit():
-            resolved = _get_city_location(loc_value)
+            resolved = await _get_city_location(loc_value)
             if not resolved:
-                logger.error(f"无法将 '{loc_value}' 解析为 LocationID")
+                logger.error("无法将 '%s' 解析为 LocationID", loc_value)
                 return None
             loc_value = resolved
 
     # 验证 date 格式并在允许范围内（今天 ~ 今天+60天）
-    try:
-        target_date = datetime.strptime(date, "%Y%m%d").date()
-    except Exception:
+    target_date = _parse_yyyymmdd(date)
+    if target_date is None:
         logger.error("date 参数格式错误，需为 yyyyMMdd，例如 20210220")
         return None
 
-    beijing_today = (datetime.now(timezone.utc) + timedelta(hours=8)).date()
+    beijing_today = datetime.now(tz=CST).date()
     max_date = beijing_today + timedelta(days=60)
     if target_date < beijing_today or target_date > max_date:
         logger.error(
-            f"date 参数超出允许范围：应在 {beijing_today.strftime('%Y%m%d')} 到 {max_date.strftime('%Y%m%d')} 之间"
+            "date 参数超出允许范围：应在 %s 到 %s 之间",
+            beijing_today.strftime('%Y%m%d'),
+            max_date.strftime('%Y%m%d'),
         )
         return None
 
-    url = f"https://{api_host}/v7/astronomy/sun"
+    path = _PATH_ASTRO_SUN
     params = {"location": loc_value, "date": date, "lang": lang}
 
-    try:
-        response = httpx.get(url, headers=auth_header, params=params)
-
-        if response.status_code != 200:
-            logger.error(
-                f"获取太阳天文数据失败 - 状态码: {response.status_code}, 响应: {response.text}"
-            )
-            return None
-
-        sun_data = response.json()
-        logger.info(f"成功获取 location={loc_value} date={date} 的太阳天文数据")
-        return sun_data
-
-    except httpx.RequestError as e:
-        logger.error(f"请求太阳天文数据时发生网络错误: {e}")
-        return None
-    except Exception as e:
-        logger.error(f"获取太阳天文数据时发生未知错误: {e}")
-        return None
+    sun_data = await _request_json(path, params, "太阳天文数据")
+    if sun_data is not None:
+        logger.info("成功获取 location=%s date=%s 的太阳天文数据", loc_value, date)
+    return sun_data
 
 
 @mcp.tool()
-def get_grid_weather_now(
+async def get_grid_weather_now(
     location: str, lang: str = "zh", unit: str = "m"
 ) -> Optional[Dict[str, Any]]:
     """
@@ -992,72 +1851,39 @@ def get_grid_weather_now(
         }
     """
     # 验证 location 参数格式（必须是经纬度坐标）
-    if not location or not str(location).strip():
+    loc_value = _norm(location)
+    if not loc_value:
         logger.error("location 参数不能为空，需为经度,纬度坐标（如 116.41,39.92）")
         return None
 
-    loc_value = str(location).strip()
-
     # 验证坐标格式
     if "," not in loc_value:
-        logger.error(
-            f"location 参数格式错误：'{loc_value}'，期望格式：经度,纬度（如 116.41,39.92）"
-        )
+        logger.error("location 参数格式错误：'%s'，期望格式：经度,纬度（如 116.41,39.92）", loc_value)
         return None
 
-    try:
-        # 解析并验证经纬度坐标
-        lon_str, lat_str = [s.strip() for s in loc_value.split(",", 1)]
-        lon = float(lon_str)
-        lat = float(lat_str)
-
-        # 验证经纬度范围
-        if not (-180 <= lon <= 180):
-            logger.error(f"经度超出有效范围 [-180, 180]：{lon}")
-            return None
-        if not (-90 <= lat <= 90):
-            logger.error(f"纬度超出有效范围 [-90, 90]：{lat}")
-            return None
-
-        # 格式化坐标为两位小数
-        formatted_loc = f"{lon:.2f},{lat:.2f}"
-        logger.info(f"格式化坐标：{loc_value} → {formatted_loc}")
-
-    except Exception as e:
-        logger.error(f"无法解析坐标参数：{loc_value}，错误：{e}")
+    # 解析、验证经纬度范围并格式化为两位小数
+    formatted_loc = _validate_coord(loc_value)
+    if formatted_loc is None:
+        logger.error("无法解析坐标参数：%s，经度应在 [-180, 180]、纬度应在 [-90, 90] 范围内", loc_value)
         return None
+    logger.info("格式化坐标：%s → %s", loc_value, formatted_loc)
 
     # 验证 unit 参数
-    if unit not in {"m", "i"}:
-        logger.error(f"无效的单位参数 unit: {unit}，支持的值: m, i")
+    if unit not in _VALID_UNITS:
+        logger.error("无效的单位参数 unit: %s，支持的值: m, i", unit)
         return None
 
-    url = f"https://{api_host}/v7/grid-weather/now"
+    path = _PATH_GRID_NOW
     params = {"location": formatted_loc, "lang": lang, "unit": unit}
 
-    try:
-        response = httpx.get(url, headers=auth_header, params=params)
-
-        if response.status_code != 200:
-            logger.error(
-                f"获取格点实时天气数据失败 - 状态码: {response.status_code}, 响应: {response.text}"
-            )
-            return None
-
-        grid_weather_data = response.json()
-        logger.info(f"成功获取坐标 {formatted_loc} 的格点实时天气数据")
-        return grid_weather_data
-
-    except httpx.RequestError as e:
-        logger.error(f"请求格点实时天气数据时发生网络错误: {e}")
-        return None
-    except Exception as e:
-        logger.error(f"获取格点实时天气数据时发生未知错误: {e}")
-        return None
+    grid_weather_data = await _request_json(path, params, "格点实时天气数据")
+    if grid_weather_data is not None:
+        logger.info("成功获取坐标 %s 的格点实时天气数据", formatted_loc)
+    return grid_weather_data
 
 
 @mcp.tool()
-def get_grid_weather_daily(
+async def get_grid_weather_daily(
     location: str, days: str = "3d", lang: str = "zh", unit: str = "m"
 ) -> Optional[Dict[str, Any]]:
     """
@@ -1111,78 +1937,44 @@ def get_grid_weather_daily(
         }
     """
     # 验证 location 参数格式（必须是经纬度坐标）
-    if not location or not str(location).strip():
+    loc_value = _norm(location)
+    if not loc_value:
         logger.error("location 参数不能为空，需为经度,纬度坐标（如 116.41,39.92）")
         return None
 
-    loc_value = str(location).strip()
-
     # 验证坐标格式
     if "," not in loc_value:
-        logger.error(
-            f"location 参数格式错误：'{loc_value}'，期望格式：经度,纬度（如 116.41,39.92）"
-        )
+        logger.error("location 参数格式错误：'%s'，期望格式：经度,纬度（如 116.41,39.92）", loc_value)
         return None
 
-    try:
-        # 解析并验证经纬度坐标
-        lon_str, lat_str = [s.strip() for s in loc_value.split(",", 1)]
-        lon = float(lon_str)
-        lat = float(lat_str)
-
-        # 验证经纬度范围
-        if not (-180 <= lon <= 180):
-            logger.error(f"经度超出有效范围 [-180, 180]：{lon}")
-            return None
-        if not (-90 <= lat <= 90):
-            logger.error(f"纬度超出有效范围 [-90, 90]：{lat}")
-            return None
-
-        # 格式化坐标为两位小数
-        formatted_loc = f"{lon:.2f},{lat:.2f}"
-        logger.info(f"格式化坐标：{loc_value} → {formatted_loc}")
-
-    except Exception as e:
-        logger.error(f"无法解析坐标参数：{loc_value}，错误：{e}")
+    # 解析、验证经纬度范围并格式化为两位小数
+    formatted_loc = _validate_coord(loc_value)
+    if formatted_loc is None:
+        logger.error("无法解析坐标参数：%s，经度应在 [-180, 180]、纬度应在 [-90, 90] 范围内", loc_value)
         return None
+    logger.info("格式化坐标：%s → %s", loc_value, formatted_loc)
 
     # 验证 days 参数
-    valid_days = ["3d", "7d"]
-    if days not in valid_days:
-        logger.error(f"无效的预报天数参数: {days}，支持的值: {', '.join(valid_days)}")
+    if days not in _VALID_GRID_DAYS:
+        logger.error("无效的预报天数参数: %s，支持的值: 3d, 7d", days)
         return None
 
     # 验证 unit 参数
-    if unit not in {"m", "i"}:
-        logger.error(f"无效的单位参数 unit: {unit}，支持的值: m, i")
+    if unit not in _VALID_UNITS:
+        logger.error("无效的单位参数 unit: %s，支持的值: m, i", unit)
         return None
 
-    url = f"https://{api_host}/v7/grid-weather/{days}"
+    path = _GRID_DAILY_PATHS[days]
     params = {"location": formatted_loc, "lang": lang, "unit": unit}
 
-    try:
-        response = httpx.get(url, headers=auth_header, params=params)
-
-        if response.status_code != 200:
-            logger.error(
-                f"获取格点每日天气预报失败 - 状态码: {response.status_code}, 响应: {response.text}"
-            )
-            return None
-
-        grid_daily_data = response.json()
-        logger.info(f"成功获取坐标 {formatted_loc} 的格点每日天气预报数据（{days}）")
-        return grid_daily_data
-
-    except httpx.RequestError as e:
-        logger.error(f"请求格点每日天气预报时发生网络错误: {e}")
-        return None
-    except Exception as e:
-        logger.error(f"获取格点每日天气预报时发生未知错误: {e}")
-        return None
+    grid_daily_data = await _request_json(path, params, "格点每日天气预报")
+    if grid_daily_data is not None:
+        logger.info("成功获取坐标 %s 的格点每日天气预报数据（%s）", formatted_loc, days)
+    return grid_daily_data
 
 
 @mcp.tool()
-def get_grid_weather_hourly(
+async def get_grid_weather_hourly(
     location: str, hours: str = "24h", lang: str = "zh", unit: str = "m"
 ) -> Optional[Dict[str, Any]]:
     """
@@ -1231,80 +2023,44 @@ def get_grid_weather_hourly(
         }
     """
     # 验证 location 参数格式（必须是经纬度坐标）
-    if not location or not str(location).strip():
+    loc_value = _norm(location)
+    if not loc_value:
         logger.error("location 参数不能为空，需为经度,纬度坐标（如 116.41,39.92）")
         return None
 
-    loc_value = str(location).strip()
-
     # 验证坐标格式
     if "," not in loc_value:
-        logger.error(
-            f"location 参数格式错误：'{loc_value}'，期望格式：经度,纬度（如 116.41,39.92）"
-        )
+        logger.error("location 参数格式错误：'%s'，期望格式：经度,纬度（如 116.41,39.92）", loc_value)
         return None
 
-    try:
-        # 解析并验证经纬度坐标
-        lon_str, lat_str = [s.strip() for s in loc_value.split(",", 1)]
-        lon = float(lon_str)
-        lat = float(lat_str)
-
-        # 验证经纬度范围
-        if not (-180 <= lon <= 180):
-            logger.error(f"经度超出有效范围 [-180, 180]：{lon}")
-            return None
-        if not (-90 <= lat <= 90):
-            logger.error(f"纬度超出有效范围 [-90, 90]：{lat}")
-            return None
-
-        # 格式化坐标为两位小数
-        formatted_loc = f"{lon:.2f},{lat:.2f}"
-        logger.info(f"格式化坐标：{loc_value} → {formatted_loc}")
-
-    except Exception as e:
-        logger.error(f"无法解析坐标参数：{loc_value}，错误：{e}")
+    # 解析、验证经纬度范围并格式化为两位小数
+    formatted_loc = _validate_coord(loc_value)
+    if formatted_loc is None:
+        logger.error("无法解析坐标参数：%s，经度应在 [-180, 180]、纬度应在 [-90, 90] 范围内", loc_value)
         return None
+    logger.info("格式化坐标：%s → %s", loc_value, formatted_loc)
 
     # 验证 hours 参数
-    valid_hours = ["24h", "72h"]
-    if hours not in valid_hours:
-        logger.error(
-            f"无效的预报小时数参数: {hours}，支持的值: {', '.join(valid_hours)}"
-        )
+    if hours not in _VALID_GRID_HOURS:
+        logger.error("无效的预报小时数参数: %s，支持的值: 24h, 72h", hours)
         return None
 
     # 验证 unit 参数
-    if unit not in {"m", "i"}:
-        logger.error(f"无效的单位参数 unit: {unit}，支持的值: m, i")
+    if unit not in _VALID_UNITS:
+        logger.error("无效的单位参数 unit: %s，支持的值: m, i", unit)
         return None
 
-    url = f"https://{api_host}/v7/grid-weather/{hours}"
+    path = _GRID_HOURLY_PATHS[hours]
     params = {"location": formatted_loc, "lang": lang, "unit": unit}
 
-    try:
-        response = httpx.get(url, headers=auth_header, params=params)
-
-        if response.status_code != 200:
-            logger.error(
-                f"获取格点逐小时天气预报失败 - 状态码: {response.status_code}, 响应: {response.text}"
-            )
-            return None
-
-        grid_hourly_data = response.json()
-        logger.info(f"成功获取坐标 {formatted_loc} 的格点逐小时天气预报数据（{hours}）")
-        return grid_hourly_data
-
-    except httpx.RequestError as e:
-        logger.error(f"请求格点逐小时天气预报时发生网络错误: {e}")
-        return None
-    except Exception as e:
-        logger.error(f"获取格点逐小时天气预报时发生未知错误: {e}")
-        return None
+    grid_hourly_data = await _request_json(path, params, "格点逐小时天气预报")
+    if grid_hourly_data is not None:
+        logger.info("成功获取坐标 %s 的格点逐小时天气预报数据（%s）", formatted_loc, hours)
+    return grid_hourly_data
 
 
 @mcp.tool()
-def get_air_quality_hourly(
+async def get_air_quality_hourly(
     location: str, hours: str = "24h", lang: str = "zh"
 ) -> Optional[Dict[str, Any]]:
     """
@@ -1348,77 +2104,41 @@ def get_air_quality_hourly(
             }
         }
     """
-    if not location or not str(location).strip():
+    loc_value = _norm(location)
+    if not loc_value:
         logger.error("location 参数不能为空，需为纬度,经度坐标（如 39.92,116.41）")
         return None
 
-    loc_value = str(location).strip()
-
     # 验证坐标格式（必须是 "纬度,经度" 格式）
     if "," not in loc_value:
-        logger.error(
-            f"location 参数格式错误：'{loc_value}'，期望格式：纬度,经度（如 39.92,116.41）"
-        )
+        logger.error("location 参数格式错误：'%s'，期望格式：纬度,经度（如 39.92,116.41）", loc_value)
         return None
 
-    try:
-        # 解析并验证经纬度坐标
-        lat_str, lon_str = [s.strip() for s in loc_value.split(",", 1)]
-        lat = float(lat_str)
-        lon = float(lon_str)
-
-        # 验证经纬度范围
-        if not (-90 <= lat <= 90):
-            logger.error(f"纬度超出有效范围 [-90, 90]：{lat}")
-            return None
-        if not (-180 <= lon <= 180):
-            logger.error(f"经度超出有效范围 [-180, 180]：{lon}")
-            return None
-
-        # 格式化坐标为两位小数
-        formatted_loc = f"{lat:.2f},{lon:.2f}"
-        logger.info(f"格式化坐标：{loc_value} → {formatted_loc}")
-
-    except Exception as e:
-        logger.error(f"无法解析坐标参数：{loc_value}，错误：{e}")
+    # 解析、验证经纬度范围并格式化为两位小数
+    coord = _validate_coord_pair(loc_value, lat_first=True)
+    if coord is None:
+        logger.error("无法解析坐标参数：%s，纬度应在 [-90, 90]、经度应在 [-180, 180] 范围内", loc_value)
         return None
+    lat, lon = coord
+    logger.info("格式化坐标：%s → %s,%s", loc_value, lat, lon)
 
     # 验证 hours 参数
-    valid_hours = {"24h", "72h", "168h"}
-    if hours not in valid_hours:
-        logger.error(
-            f"无效的预报小时数参数: {hours}，支持的值: {', '.join(sorted(valid_hours))}"
-        )
+    if hours not in _VALID_HOURS:
+        logger.error("无效的预报小时数参数: %s，支持的值: 24h, 72h, 168h", hours)
         return None
 
     # API端点格式: /airquality/v1/hourly/{latitude}/{longitude}
-    lat, lon = formatted_loc.split(",")
-    url = f"https://{api_host}/airquality/v1/hourly/{lat}/{lon}"
+    path = f"{_PATH_AIR_HOURLY}/{lat}/{lon}"
     params = {"hours": hours, "lang": lang}
 
-    try:
-        response = httpx.get(url, headers=auth_header, params=params)
-
-        if response.status_code != 200:
-            logger.error(
-                f"获取空气质量小时预报数据失败 - 状态码: {response.status_code}, 响应: {response.text}"
-            )
-            return None
-
-        air_hourly_data = response.json()
-        logger.info(f"成功获取坐标 {formatted_loc} 的空气质量小时预报数据（{hours}）")
-        return air_hourly_data
-
-    except httpx.RequestError as e:
-        logger.error(f"请求空气质量小时预报数据时发生网络错误: {e}")
-        return None
-    except Exception as e:
-        logger.error(f"获取空气质量小时预报数据时发生未知错误: {e}")
-        return None
+    air_hourly_data = await _request_json(path, params, "空气质量小时预报数据")
+    if air_hourly_data is not None:
+        logger.info("成功获取坐标 %s,%s 的空气质量小时预报数据（%s）", lat, lon, hours)
+    return air_hourly_data
 
 
 @mcp.tool()
-def get_air_quality_daily(
+async def get_air_quality_daily(
     location: str, days: str = "3d", lang: str = "zh"
 ) -> Optional[Dict[str, Any]]:
     """
@@ -1462,75 +2182,41 @@ def get_air_quality_daily(
             }
         }
     """
-    if not location or not str(location).strip():
+    loc_value = _norm(location)
+    if not loc_value:
         logger.error("location 参数不能为空，需为纬度,经度坐标（如 39.92,116.41）")
         return None
 
-    loc_value = str(location).strip()
-
     # 验证坐标格式（必须是 "纬度,经度" 格式）
     if "," not in loc_value:
-        logger.error(
-            f"location 参数格式错误：'{loc_value}'，期望格式：纬度,经度（如 39.92,116.41）"
-        )
+        logger.error("location 参数格式错误：'%s'，期望格式：纬度,经度（如 39.92,116.41）", loc_value)
         return None
 
-    try:
-        # 解析并验证经纬度坐标
-        lat_str, lon_str = [s.strip() for s in loc_value.split(",", 1)]
-        lat = float(lat_str)
-        lon = float(lon_str)
-
-        # 验证经纬度范围
-        if not (-90 <= lat <= 90):
-            logger.error(f"纬度超出有效范围 [-90, 90]：{lat}")
-            return None
-        if not (-180 <= lon <= 180):
-            logger.error(f"经度超出有效范围 [-180, 180]：{lon}")
-            return None
-
-        # 格式化坐标为两位小数
-        formatted_loc = f"{lat:.2f},{lon:.2f}"
-        logger.info(f"格式化坐标：{loc_value} → {formatted_loc}")
-
-    except Exception as e:
-        logger.error(f"无法解析坐标参数：{loc_value}，错误：{e}")
+    # 解析、验证经纬度范围并格式化为两位小数
+    coord = _validate_coord_pair(loc_value, lat_first=True)
+    if coord is None:
+        logger.error("无法解析坐标参数：%s，纬度应在 [-90, 90]、经度应在 [-180, 180] 范围内", loc_value)
         return None
+    lat, lon = coord
+    logger.info("格式化坐标：%s → %s,%s", loc_value, lat, lon)
 
     # 验证 days 参数
-    valid_days = {"3d", "7d", "15d"}
-    if days not in valid_days:
-        logger.error(f"无效的预报天数参数: {days}，支持的值: {', '.join(sorted(valid_days))}")
+    if days not in _VALID_AIR_DAYS:
+        logger.error("无效的预报天数参数: %s，支持的值: 3d, 7d, 15d", days)
         return None
 
     # API端点格式: /airquality/v1/daily/{latitude}/{longitude}
-    lat, lon = formatted_loc.split(",")
-    url = f"https://{api_host}/airquality/v1/daily/{lat}/{lon}"
+    path = f"{_PATH_AIR_DAILY}/{lat}/{lon}"
     params = {"days": days, "lang": lang}
 
-    try:
-        response = httpx.get(url, headers=auth_header, params=params)
-
-        if response.status_code != 200:
-            logger.error(
-                f"获取空气质量每日预报数据失败 - 状态码: {response.status_code}, 响应: {response.text}"
-            )
-            return None
-
-        air_daily_data = response.json()
-        logger.info(f"成功获取坐标 {formatted_loc} 的空气质量每日预报数据（{days}）")
-        return air_daily_data
-
-    except httpx.RequestError as e:
-        logger.error(f"请求空气质量每日预报数据时发生网络错误: {e}")
-        return None
-    except Exception as e:
-        logger.error(f"获取空气质量每日预报数据时发生未知错误: {e}")
-        return None
+    air_daily_data = await _request_json(path, params, "空气质量每日预报数据")
+    if air_daily_data is not None:
+        logger.info("成功获取坐标 %s,%s 的空气质量每日预报数据（%s）", lat, lon, days)
+    return air_daily_data
 
 
 @mcp.tool()
-def get_air_quality_stations(
+async def get_air_quality_stations(
     station_id: str, lang: str = "zh"
 ) -> Optional[Dict[str, Any]]:
     """
@@ -1566,44 +2252,28 @@ def get_air_quality_stations(
             ]
         }
     """
-    if not station_id or not str(station_id).strip():
+    station_value = _norm(station_id)
+    if not station_value:
         logger.error("station_id 参数不能为空，需为空气质量监测站ID（如 P58911）")
         return None
 
-    station_value = str(station_id).strip()
-
     # 验证监测站ID格式（应该以P开头，后跟数字）
     if not station_value.startswith('P') or not station_value[1:].isdigit():
-        logger.error(f"监测站ID格式可能不正确: {station_value}，期望格式: P58911")
+        logger.error("监测站ID格式可能不正确: %s，期望格式: P58911", station_value)
         # 这里不返回None，因为可能有其他格式的监测站ID
 
     # 根据官方文档，API端点格式: /airquality/v1/station/{station_id}
-    url = f"https://{api_host}/airquality/v1/station/{station_value}"
+    path = f"{_PATH_AIR_STATION}/{station_value}"
     params = {"lang": lang}
 
-    try:
-        response = httpx.get(url, headers=auth_header, params=params)
-
-        if response.status_code != 200:
-            logger.error(
-                f"获取空气质量监测站数据失败 - 状态码: {response.status_code}, 响应: {response.text}"
-            )
-            return None
-
-        stations_data = response.json()
-        logger.info(f"成功获取监测站 '{station_value}' 的污染物浓度数据")
-        return stations_data
-
-    except httpx.RequestError as e:
-        logger.error(f"请求空气质量监测站数据时发生网络错误: {e}")
-        return None
-    except Exception as e:
-        logger.error(f"获取空气质量监测站数据时发生未知错误: {e}")
-        return None
+    stations_data = await _request_json(path, params, "空气质量监测站数据")
+    if stations_data is not None:
+        logger.info("成功获取监测站 '%s' 的污染物浓度数据", station_value)
+    return stations_data
 
 
 @mcp.tool()
-def get_top_cities(
+async def get_top_cities(
     number: int = 10, city_type: str = "cn", lang: str = "zh"
 ) -> Optional[Dict[str, Any]]:
     """
@@ -1649,41 +2319,25 @@ def get_top_cities(
     """
     # 验证 number 参数
     if not isinstance(number, int) or number < 1 or number > 100:
-        logger.error(f"无效的 number 参数: {number}，支持的范围为 1-100 的整数")
+        logger.error("无效的 number 参数: %s，支持的范围为 1-100 的整数", number)
         return None
 
     # 验证 city_type 参数
-    valid_types = {"cn", "world", "overseas"}
-    if city_type not in valid_types:
-        logger.error(f"无效的 city_type 参数: {city_type}，支持的值: {', '.join(sorted(valid_types))}")
+    if city_type not in _VALID_CITY_TYPES:
+        logger.error("无效的 city_type 参数: %s，支持的值: cn, world, overseas", city_type)
         return None
 
-    url = f"https://{api_host}/geo/v2/city/top"
+    path = _PATH_TOP_CITIES
     params = {"number": str(number), "type": city_type, "lang": lang}
 
-    try:
-        response = httpx.get(url, headers=auth_header, params=params)
-
-        if response.status_code != 200:
-            logger.error(
-                f"获取热门城市数据失败 - 状态码: {response.status_code}, 响应: {response.text}"
-            )
-            return None
-
-        top_cities_data = response.json()
-        logger.info(f"成功获取热门城市数据，类型: {city_type}，数量: {number}")
-        return top_cities_data
-
-    except httpx.RequestError as e:
-        logger.error(f"请求热门城市数据时发生网络错误: {e}")
-        return None
-    except Exception as e:
-        logger.error(f"获取热门城市数据时发生未知错误: {e}")
-        return None
+    top_cities_data = await _request_json(path, params, "热门城市数据")
+    if top_cities_data is not None:
+        logger.info("成功获取热门城市数据，类型: %s，数量: %s", city_type, number)
+    return top_cities_data
 
 
 @mcp.tool()
-def search_poi(
+async def search_poi(
     location: str,
     keyword: str,
     poi_type: str,
@@ -1735,120 +2389,88 @@ def search_poi(
         }
     """
     # 验证必需参数
-    if not location or not str(location).strip():
+    loc_value = _norm(location)
+    if not loc_value:
         logger.error("location 参数不能为空")
         return None
 
-    if not keyword or not str(keyword).strip():
+    keyword = _norm(keyword)
+    if not keyword:
         logger.error("keyword 参数不能为空")
         return None
 
     # 验证POI类型
     if poi_type not in POI_TYPES:
-        logger.error(f"无效的POI类型: {poi_type}，支持的类型: {', '.join(POI_TYPES.keys())}")
+        logger.error("无效的POI类型: %s，支持的类型: %s", poi_type, ', '.join(POI_TYPES.keys()))
         return None
 
     # 验证radius参数
     if not isinstance(radius, int) or radius < 100 or radius > 50000:
-        logger.error(f"无效的 radius 参数: {radius}，支持的范围为 100-50000 米")
+        logger.error("无效的 radius 参数: %s，支持的范围为 100-50000 米", radius)
         return None
 
     # 验证page参数
     if not isinstance(page, int) or page < 1:
-        logger.error(f"无效的 page 参数: {page}，必须为大于0的整数")
+        logger.error("无效的 page 参数: %s，必须为大于0的整数", page)
         return None
 
     # 处理location参数
-    loc_value = str(location).strip()
-
     if "," in loc_value:
         # 经纬度坐标处理
-        try:
-            parts = [s.strip() for s in loc_value.split(",", 1)]
-            if len(parts) != 2:
-                logger.error(f"坐标格式错误: {loc_value}，期望格式: 经度,纬度")
-                return None
-
-            lon = float(parts[0])
-            lat = float(parts[1])
-
-            # 验证经纬度范围
-            if not (-180 <= lon <= 180):
-                logger.error(f"经度超出有效范围 [-180, 180]: {lon}")
-                return None
-            if not (-90 <= lat <= 90):
-                logger.error(f"纬度超出有效范围 [-90, 90]: {lat}")
-                return None
-
-            # 格式化坐标
-            formatted_loc = f"{lon:.2f},{lat:.2f}"
-            logger.info(f"使用坐标搜索: {formatted_loc}")
-
-        except ValueError:
-            logger.error(f"无法解析坐标: {loc_value}")
+        formatted_loc = _validate_coord(loc_value)
+        if formatted_loc is None:
+            logger.error("无法解析坐标: %s，期望格式: 经度,纬度", loc_value)
             return None
+        logger.info("使用坐标搜索: %s", formatted_loc)
     elif loc_value.isdigit():
         # LocationID处理
         formatted_loc = loc_value
-        logger.info(f"使用LocationID搜索: {formatted_loc}")
+        logger.info("使用LocationID搜索: %s", formatted_loc)
     else:
-        # 城市名称处理
-        location_id = _get_city_location(loc_value)
-        if not location_id:
-            logger.error(f"无法获取城市 '{loc_value}' 的LocationID")
-            return None
-        formatted_loc = location_id
-        logger.info(f"城市 '{loc_value}' 解析为LocationID: {formatted_loc}")
+        # 城市名称处理，稍后与 city 参数的解析并发进行
+        formatted_loc = ""
+
+    # 如果指定了城市，添加city参数；LocationID 直接使用，其余（城市名或坐标）需解析
+    city = _norm(city)
+    city_id: Optional[str] = city if city.isdigit() else None
+    resolve_loc = not formatted_loc
+    resolve_city = bool(city) and city_id is None
+
+    if resolve_loc or resolve_city:
+        # 地区与城市的 LocationID 查询互不依赖，并发请求
+        resolved = await asyncio.gather(
+            _get_city_location(loc_value) if resolve_loc else _no_lookup(),
+            _get_city_location(city) if resolve_city else _no_lookup(),
+        )
+        if resolve_loc:
+            if not resolved[0]:
+                logger.error("无法获取城市 '%s' 的LocationID", loc_value)
+                return None
+            formatted_loc = resolved[0]
+            logger.info("城市 '%s' 解析为LocationID: %s", loc_value, formatted_loc)
+        if resolve_city:
+            city_id = resolved[1]
 
-    url = f"https://{api_host}/geo/v2/poi/lookup"
+    path = _PATH_POI_LOOKUP
     params = {
         "location": formatted_loc,
-        "keyword": keyword.strip(),
+        "keyword": keyword,
         "type": poi_type,
         "radius": str(radius),
         "page": str(page),
         "lang": lang
     }
+    if city_id:
+        params["city"] = city_id
 
-    # 如果指定了城市，添加city参数
-    if city and city.strip():
-        if "," in city.strip():
-            # 如果city也是坐标，需要转换为LocationID
-            city_loc = _get_city_location(city.strip())
-            if city_loc:
-                params["city"] = city_loc
-        elif city.strip().isdigit():
-            # 如果是LocationID
-            params["city"] = city.strip()
-        else:
-            # 如果是城市名，获取LocationID
-            city_location_id = _get_city_location(city.strip())
-            if city_location_id:
-                params["city"] = city_location_id
-
-    try:
-        response = httpx.get(url, headers=auth_header, params=params)
-
-        if response.status_code != 200:
-            logger.error(
-                f"POI搜索失败 - 状态码: {response.status_code}, 响应: {response.text}"
-            )
-            return None
-
-        poi_data = response.json()
-        logger.info(f"成功搜索POI，关键词: '{keyword}'，类型: {poi_type}，位置: {loc_value}")
-        return poi_data
-
-    except httpx.RequestError as e:
-        logger.error(f"POI搜索请求时发生网络错误: {e}")
-        return None
-    except Exception as e:
-        logger.error(f"POI搜索时发生未知错误: {e}")
-        return None
+    poi_data = await _request_json(path, params, "POI搜索结果")
+    if poi_data is not None:
+        logger.info("成功搜索POI，关键词: '%s'，类型: %s，位置: %s", keyword, poi_type, loc_value)
+    return poi_data
 
 
 @mcp.tool()
-def search_poi_range(
+async def search_poi_range(
     location: str,
     poi_type: str,
     radius: int = 5,
@@ -1899,17 +2521,18 @@ def search_poi_range(
         }
     """
     # 验证必需参数
-    if not location or not str(location).strip():
+    loc_value = _norm(location)
+    if not loc_value:
         logger.error("location 参数不能为空，需为经度,纬度坐标（如 116.41,39.92）")
         return None
 
     if not isinstance(page, int) or page < 1:
-        logger.error(f"无效的 page 参数: {page}，必须为大于0的整数")
+        logger.error("无效的 page 参数: %s，必须为大于0的整数", page)
         return None
 
     # 验证radius参数（范围1-50公里）
     if not isinstance(radius, int) or radius < 1 or radius > 50:
-        logger.error(f"无效的 radius 参数: {radius}，支持的范围为 1-50 公里")
+        logger.error("无效的 radius 参数: %s，支持的范围为 1-50 公里", radius)
         return None
 
     # 使用整数radius值
@@ -1917,45 +2540,24 @@ def search_poi_range(
 
     # 验证POI类型
     if poi_type not in POI_TYPES:
-        logger.error(f"无效的POI类型: {poi_type}，支持的类型: {', '.join(POI_TYPES.keys())}")
+        logger.error("无效的POI类型: %s，支持的类型: %s", poi_type, ', '.join(POI_TYPES.keys()))
         return None
 
-    loc_value = str(location).strip()
-
     # 强制要求坐标格式
     if "," not in loc_value:
         logger.error(
-            f"location 参数格式错误：'{loc_value}'，POI范围搜索仅支持经纬度坐标，期望格式：经度,纬度（如 116.41,39.92）"
+            "location 参数格式错误：'%s'，POI范围搜索仅支持经纬度坐标，期望格式：经度,纬度（如 116.41,39.92）", loc_value
         )
         return None
 
-    try:
-        # 解析并验证经纬度坐标
-        parts = [s.strip() for s in loc_value.split(",", 1)]
-        if len(parts) != 2:
-            logger.error(f"坐标格式错误: {loc_value}，期望格式: 经度,纬度")
-            return None
-
-        lon = float(parts[0])
-        lat = float(parts[1])
-
-        # 验证经纬度范围
-        if not (-180 <= lon <= 180):
-            logger.error(f"经度超出有效范围 [-180, 180]: {lon}")
-            return None
-        if not (-90 <= lat <= 90):
-            logger.error(f"纬度超出有效范围 [-90, 90]: {lat}")
-            return None
-
-        # 格式化坐标为两位小数
-        formatted_loc = f"{lon:.2f},{lat:.2f}"
-        logger.info(f"使用坐标范围搜索：{loc_value} → {formatted_loc}")
-
-    except ValueError as e:
-        logger.error(f"无法解析坐标参数：{loc_value}，错误：{e}")
+    # 解析、验证经纬度范围并格式化为两位小数
+    formatted_loc = _validate_coord(loc_value)
+    if formatted_loc is None:
+        logger.error("无法解析坐标参数：%s，经度应在 [-180, 180]、纬度应在 [-90, 90] 范围内", loc_value)
         return None
+    logger.info("使用坐标范围搜索：%s → %s", loc_value, formatted_loc)
 
-    url = f"https://{api_host}/geo/v2/poi/range"
+    path = _PATH_POI_RANGE
     params = {
         "location": formatted_loc,
         "type": poi_type,
@@ -1965,35 +2567,62 @@ def search_poi_range(
     }
 
     # 如果指定了城市，添加city参数
-    if city and city.strip():
-        if city.strip().isdigit():
+    city = _norm(city)
+    if city:
+        if city.isdigit():
             # 如果是LocationID
-            params["city"] = city.strip()
+            params["city"] = city
         else:
             # 如果是城市名，获取LocationID
-            city_location_id = _get_city_location(city.strip())
+            city_location_id = await _get_city_location(city)
             if city_location_id:
                 params["city"] = city_location_id
 
+    poi_range_data = await _request_json(path, params, "POI范围搜索结果")
+    if poi_range_data is not None:
+        logger.info(
+            "成功搜索POI范围，中心点: %s，类型: %s，半径: %s公里", formatted_loc, poi_type, radius_int
+        )
+    return poi_range_data
+
+
+async def _serve(transport: str) -> None:
+    """
+    运行MCP服务，并在服务退出时关闭共享的HTTP客户端
+
+    Args:
+        transport: 传输协议，"stdio" 或 "streamable-http"
+    """
     try:
-        response = httpx.get(url, headers=auth_header, params=params)
+        if transport == "stdio":
+            await mcp.run_stdio_async()
+        else:
+            await mcp.run_streamable_http_async()
+    finally:
+        await _ACLIENT.aclose()
+        if _DISK_CACHE is not None:
+            _DISK_CACHE.close()
 
-        if response.status_code != 200:
-            logger.error(
-                f"POI范围搜索失败 - 状态码: {response.status_code}, 响应: {response.text}"
-            )
-            return None
 
-        poi_range_data = response.json()
-        logger.info(f"成功搜索POI范围，中心点: {formatted_loc}，类型: {poi_type}，半径: {radius_int}公里")
-        return poi_range_data
+def _run(transport: str) -> None:
+    """
+    在事件循环中运行MCP服务
 
-    except httpx.RequestError as e:
-        logger.error(f"POI范围搜索请求时发生网络错误: {e}")
-        return None
-    except Exception as e:
-        logger.error(f"POI范围搜索时发生未知错误: {e}")
-        return None
+    安装了 uvloop（pip install hefeng-qweather-mcp[uvloop]，不支持 Windows）时
+    使用其基于 libuv 的事件循环，否则使用 asyncio 默认事件循环
+
+    Args:
+        transport: 传输协议，"stdio" 或 "streamable-http"
+    """
+    try:
+        import uvloop  # type: ignore[import-not-found]
+    except ImportError:
+        asyncio.run(_serve(transport))
+        return
+
+    logger.info("使用 uvloop 事件循环")
+    with asyncio.Runner(loop_factory=uvloop.new_event_loop) as runner:
+        runner.run(_serve(transport))
 
 
 @app.command()
@@ -2005,18 +2634,18 @@ def http() -> None:
     """
     try:
         logger.info("正在启动和风天气MCP服务...")
-        logger.info(f"API主机: {api_host}")
+        logger.info("API主机: %s", api_host)
         if api_key:
-            logger.info(f"API KEY: {api_key[:10]}...")
+            logger.info("API KEY: %s...", api_key[:10])
         else:
-            logger.info(f"项目ID: {project_id}")
-            logger.info(f"密钥ID: {key_id}")
+            logger.info("项目ID: %s", project_id)
+            logger.info("密钥ID: %s", key_id)
         logger.info("服务启动成功，等待连接...")
-        mcp.run(transport="streamable-http")
+        _run("streamable-http")
     except KeyboardInterrupt:
         logger.info("服务被用户中断")
     except Exception as e:
-        logger.error(f"服务启动失败: {e}")
+        logger.error("服务启动失败: %s", e)
         raise
 
 
@@ -2029,18 +2658,18 @@ def stdio() -> None:
     """
     try:
         logger.info("正在启动和风天气MCP服务...")
-        logger.info(f"API主机: {api_host}")
+        logger.info("API主机: %s", api_host)
         if api_key:
-            logger.info(f"API KEY: {api_key[:10]}...")
+            logger.info("API KEY: %s...", api_key[:10])
         else:
-            logger.info(f"项目ID: {project_id}")
-            logger.info(f"密钥ID: {key_id}")
+            logger.info("项目ID: %s", project_id)
+            logger.info("密钥ID: %s", key_id)
         logger.info("服务启动成功，等待连接...")
-        mcp.run(transport="stdio")
+        _run("stdio")
     except KeyboardInterrupt:
         logger.info("服务被用户中断")
     except Exception as e:
-        logger.error(f"服务启动失败: {e}")
+        logger.error("服务启动失败: %s", e)
         raise
 
 